@@ -0,0 +1,189 @@
+"""
+Admission control for the fake news web API.
+Bounded per-route concurrency with a bounded, size-prioritized wait queue that sheds load instead of queueing without limit.
+
+A route admits up to max_concurrent requests at once. Further requests wait in a queue
+of at most max_queue entries, ordered by cost (the request's Content-Length), so small
+requests are served before large ones. When the queue is full, a newcomer smaller than
+the largest waiter takes its place and the displaced request is rejected; otherwise the
+newcomer is rejected. Waiters that are not admitted within queue_timeout seconds are
+rejected as well. Rejected requests get 429 with a Retry-After estimated from recent
+service times, so latency for admitted work stays bounded under bursts.
+
+Limits are per process; under a multi-worker server every worker enforces its own.
+"""
+
+import heapq
+import itertools
+import math
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+# Defaults, overridable through FAKE_NEWS_ADMISSION_* and per-route environment variables
+DEFAULT_MAX_CONCURRENT = 4
+DEFAULT_MAX_QUEUE = 32
+DEFAULT_QUEUE_TIMEOUT = 2.0
+
+# Weight of the newest sample in the moving average of service time
+_SERVICE_TIME_SMOOTHING = 0.1
+
+
+class _Waiter:
+    """A queued request: heap entry ordered by (cost, arrival)."""
+
+    __slots__ = ("cost", "sequence", "event", "admitted", "rejected")
+
+    def __init__(self, cost: int, sequence: int) -> None:
+        self.cost = cost
+        self.sequence = sequence
+        self.event = threading.Event()
+        self.admitted = False
+        self.rejected = False
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.cost, self.sequence) < (other.cost, other.sequence)
+
+
+class Rejected(Exception):
+    """Raised by AdmissionController.acquire when a request is shed."""
+
+    def __init__(self, reason: str, retry_after: int) -> None:
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Concurrency limit and priority wait queue for one route.
+    All operations are guarded by a lock and safe to call from multiple threads.
+    """
+
+    def __init__(self, max_concurrent: int = DEFAULT_MAX_CONCURRENT, max_queue: int = DEFAULT_MAX_QUEUE,
+                 queue_timeout: float = DEFAULT_QUEUE_TIMEOUT) -> None:
+        """
+        Initialize the controller.
+
+        Args:
+            max_concurrent: Requests served at once
+            max_queue: Requests allowed to wait for a slot (0 rejects as soon as all slots are busy)
+            queue_timeout: Seconds a request may wait before it is rejected
+        """
+        if max_concurrent < 1 or max_queue < 0:
+            raise ValueError(f"Invalid admission limits: {max_concurrent} concurrent, {max_queue} queued")
+
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._lock = threading.Lock()
+        self._queue: List[_Waiter] = []
+        self._sequence = itertools.count()
+        self._service_time = 0.0
+
+        self.active = 0
+        self.admitted = 0
+        self.rejected: Dict[str, int] = {"queue_full": 0, "displaced": 0, "timeout": 0}
+
+    @classmethod
+    def from_env(cls, prefix: str) -> Optional["AdmissionController"]:
+        """
+        Build a controller from FAKE_NEWS_<prefix>_{CONCURRENCY,QUEUE,QUEUE_TIMEOUT}.
+
+        Unset variables fall back to FAKE_NEWS_ADMISSION_{CONCURRENCY,QUEUE,QUEUE_TIMEOUT}
+        and then to the module defaults.
+
+        Returns:
+            The controller, or None when the concurrency limit is 0 (admission disabled)
+        """
+        def setting(name: str, default: str) -> str:
+            fallback = os.environ.get(f"FAKE_NEWS_ADMISSION_{name}", default)
+            return os.environ.get(f"FAKE_NEWS_{prefix}_{name}", fallback)
+
+        max_concurrent = int(setting("CONCURRENCY", str(DEFAULT_MAX_CONCURRENT)))
+        if max_concurrent <= 0:
+            return None
+        return cls(max_concurrent, int(setting("QUEUE", str(DEFAULT_MAX_QUEUE))),
+                   float(setting("QUEUE_TIMEOUT", str(DEFAULT_QUEUE_TIMEOUT))))
+
+    def acquire(self, cost: int = 0) -> float:
+        """
+        Wait for a slot.
+
+        Args:
+            cost: Relative size of the request; cheaper waiters are admitted first
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            Rejected: If the queue is full or the wait timed out
+        """
+        started = time.monotonic()
+        with self._lock:
+            if self.active < self.max_concurrent and not self._queue:
+                self.active += 1
+                self.admitted += 1
+                return 0.0
+
+            waiter = _Waiter(cost, next(self._sequence))
+            if len(self._queue) >= self.max_queue:
+                largest = max(self._queue) if self._queue else None
+                if largest is None or not waiter < largest:
+                    self.rejected["queue_full"] += 1
+                    raise Rejected("queue_full", self._retry_after())
+                self._queue.remove(largest)
+                heapq.heapify(self._queue)
+                largest.rejected = True
+                largest.event.set()
+                self.rejected["displaced"] += 1
+            heapq.heappush(self._queue, waiter)
+
+        waiter.event.wait(self.queue_timeout)
+
+        with self._lock:
+            if waiter.admitted:
+                return time.monotonic() - started
+            if not waiter.rejected:
+                self._queue.remove(waiter)
+                heapq.heapify(self._queue)
+                self.rejected["timeout"] += 1
+            raise Rejected("displaced" if waiter.rejected else "timeout", self._retry_after())
+
+    def release(self, service_time: Optional[float] = None) -> None:
+        """
+        Free a slot, handing it straight to the cheapest waiter if there is one.
+
+        Args:
+            service_time: Seconds the request held its slot, used for Retry-After estimates
+        """
+        with self._lock:
+            if service_time is not None:
+                self._service_time += _SERVICE_TIME_SMOOTHING * (service_time - self._service_time)
+            if self._queue:
+                waiter = heapq.heappop(self._queue)
+                waiter.admitted = True
+                self.admitted += 1
+                waiter.event.set()
+            else:
+                self.active -= 1
+
+    def _retry_after(self) -> int:
+        """Seconds until a retry is likely to be admitted (caller holds the lock)."""
+        backlog = (len(self._queue) + self.active) / self.max_concurrent
+        return max(1, math.ceil(backlog * self._service_time))
+
+    def stats(self) -> Dict[str, float]:
+        """Snapshot of slot usage, queue depth and rejection counters."""
+        with self._lock:
+            return {
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "active": self.active,
+                "queue_depth": len(self._queue),
+                "admitted": self.admitted,
+                "rejected": sum(self.rejected.values()),
+                **{f"rejected_{reason}": count for reason, count in self.rejected.items()},
+                "service_time": self._service_time
+            }
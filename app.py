@@ -3,23 +3,313 @@ Fake News Generator and Detector Web Application
 A Flask-based web interface for the fake news generator and detector.
 """
 
-from flask import Flask, render_template, request, jsonify, redirect, url_for
+from flask import Flask, Response, g, render_template, request, redirect, url_for, stream_with_context
 from main import FakeNewsGenerator, FakeNewsDetector, NewsArticle, DetectionResult
+from cache import DetectionCache
+from near_duplicates import NearDuplicateIndex
+from admission import AdmissionController, Rejected
+from article_pool import ArticlePool
+import metrics
+from logging_config import configure_logging
+from lexicons import PackWatcher
+import responses
+from responses import api_response, article_to_dict, detection_to_dict, parse_selection
+import copy
+import hmac
 import logging
+import os
+import threading
+import time
+from typing import Iterator, Optional
 from datetime import datetime
 import json
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+# Logging is configured by entry points (see logging_config.configure_logging)
 logger = logging.getLogger(__name__)
 
 # Initialize Flask app
 app = Flask(__name__)
 app.secret_key = "fake_news_detector_secret_key_2024"
+responses.install(app)
 
 # Initialize components
-generator = FakeNewsGenerator()
-detector = FakeNewsDetector()
+detection_cache = DetectionCache(
+    max_size=int(os.environ.get("DETECTION_CACHE_SIZE", "10000")),
+    ttl=float(os.environ.get("DETECTION_CACHE_TTL", "3600"))
+)
+
+# Near-copies of already-scored articles are answered from this index (see
+# near_duplicates.py); off unless FAKE_NEWS_NEAR_DUPLICATE_SIZE is set, since a match
+# returns the earlier article's result rather than an exact one
+_near_duplicate_size = int(os.environ.get("FAKE_NEWS_NEAR_DUPLICATE_SIZE", "0"))
+near_duplicate_index = NearDuplicateIndex(
+    max_size=_near_duplicate_size,
+    threshold=float(os.environ.get("FAKE_NEWS_NEAR_DUPLICATE_THRESHOLD", "0.75"))
+) if _near_duplicate_size > 0 else None
+
+# The generator and detector are built on first use (see get_generator, get_detector and
+# warm_up), so importing this module stays cheap
+_engine_lock = threading.Lock()
+_generator = None
+_detector = None
+
+# Seconds between lexicon pack change checks (0 disables watching)
+LEXICON_WATCH_INTERVAL = float(os.environ.get("FAKE_NEWS_LEXICON_WATCH", "2"))
+
+# Bearer token required by the admin endpoints (unset disables them)
+ADMIN_TOKEN = os.environ.get("FAKE_NEWS_ADMIN_TOKEN")
+
+_lexicon_watcher = None
+_lexicon_watcher_pid = None
+
+# Pre-generated articles served by /api/generate and /api/generate-and-detect (None when
+# FAKE_NEWS_POOL_SIZE is 0, see article_pool.py); built on first use by get_article_pool
+_article_pool = None
+_article_pool_built = False
+
+# Upper bound on the number of articles accepted by /api/detect/batch
+MAX_BATCH_SIZE = 1000
+
+# Upper bound on the number of articles streamed by /api/generate/stream
+MAX_STREAM_COUNT = int(os.environ.get("FAKE_NEWS_MAX_STREAM_COUNT", "1000000"))
+
+# Articles generated (and detected) per chunk written by /api/generate/stream
+STREAM_CHUNK_SIZE = 64
+
+# Admission control of the expensive API routes (None when disabled); limits come from
+# FAKE_NEWS_<PREFIX>_CONCURRENCY, _QUEUE and _QUEUE_TIMEOUT (see admission.py)
+ADMISSION = {
+    route: AdmissionController.from_env(prefix)
+    for route, prefix in (
+        ("/api/detect", "DETECT"),
+        ("/api/detect/batch", "DETECT_BATCH"),
+        ("/api/generate-and-detect", "GENERATE_AND_DETECT"),
+        ("/api/generate/stream", "GENERATE_STREAM")
+    )
+}
+
+
+def get_generator() -> FakeNewsGenerator:
+    """Return the shared generator, building it on first use."""
+    global _generator
+    
+    generator = _generator
+    if generator is None:
+        with _engine_lock:
+            if _generator is None:
+                _generator = FakeNewsGenerator()
+            generator = _generator
+    return generator
+
+
+def get_detector() -> FakeNewsDetector:
+    """
+    Return the shared detector, building it on first use.
+    
+    Construction loads the configured lexicon pack and model, so it happens at most once
+    per process however many threads ask for the detector concurrently.
+    """
+    global _detector
+    
+    detector = _detector
+    if detector is None:
+        with _engine_lock:
+            if _detector is None:
+                phrase_matching = os.environ.get("FAKE_NEWS_PHRASE_MATCHING", "0").lower() in ("1", "true", "yes", "on")
+                _detector = FakeNewsDetector(
+                    cache=detection_cache,
+                    phrase_matching=phrase_matching,
+                    lexicon_pack=os.environ.get("FAKE_NEWS_LEXICON_PACK") or None,
+                    model_path=os.environ.get("FAKE_NEWS_MODEL") or None,
+                    near_duplicates=near_duplicate_index
+                )
+            detector = _detector
+    return detector
+
+
+def get_article_pool() -> Optional[ArticlePool]:
+    """
+    Return the article pool, building it on first use.
+    
+    The pool's refill thread is started in the calling process if it does not run there
+    yet, so pre-fork workers each fill their own pool.
+    
+    Returns:
+        The pool, or None when pooling is disabled
+    """
+    global _article_pool, _article_pool_built
+    
+    if not _article_pool_built:
+        with _engine_lock:
+            if not _article_pool_built:
+                _article_pool = ArticlePool.from_env()
+                _article_pool_built = True
+    pool = _article_pool
+    if pool is not None:
+        pool.start()
+    return pool
+
+
+def generate_article(category: str = "random") -> NewsArticle:
+    """Take an article from the pool, generating one inline on a miss."""
+    pool = get_article_pool()
+    article = pool.get(category) if pool is not None else None
+    return article if article is not None else get_generator().generate_fake_news(category)
+
+
+def warm_up() -> None:
+    """
+    Build the engine objects ahead of traffic.
+    
+    Entry points call this before serving (serve.py does so in the master process, so
+    forked workers share the result); without it the first request pays for loading
+    the lexicon pack and model.
+    """
+    started = time.perf_counter()
+    get_generator()
+    get_detector()
+    logger.info("Warm-up completed in %.3fs", time.perf_counter() - started, extra={"event": "warm_up"})
+
+
+def start_lexicon_watcher() -> None:
+    """
+    Watch the configured lexicon pack and hot-reload it on change.
+    
+    Entry points call this after warm_up in the process that serves requests: pre-fork
+    servers in every worker (threads do not survive fork, and a watcher in the master
+    would be running while it forks), single-process servers before app.run. Calls in a
+    process that already runs a watcher, or has not built its detector yet, are no-ops.
+    """
+    global _lexicon_watcher, _lexicon_watcher_pid
+    
+    detector = _detector
+    if detector is None or detector.lexicon_pack is None or LEXICON_WATCH_INTERVAL <= 0:
+        return
+    with _engine_lock:
+        if _lexicon_watcher_pid == os.getpid() and _lexicon_watcher.is_alive():
+            return
+        
+        _lexicon_watcher = PackWatcher(detector.lexicon_pack, detector.load_lexicons, LEXICON_WATCH_INTERVAL)
+        _lexicon_watcher_pid = os.getpid()
+        _lexicon_watcher.start()
+
+
+metrics.REGISTRY.describe("fake_news_http_request_seconds", "Latency of HTTP requests by route in seconds")
+metrics.REGISTRY.describe("fake_news_http_requests_total", "HTTP requests by route and status code")
+metrics.REGISTRY.describe("fake_news_admission_wait_seconds", "Time admitted requests spent queued by route")
+metrics.REGISTRY.describe("fake_news_admission_rejections_total", "Requests shed with 429 by route and reason")
+metrics.REGISTRY.describe("fake_news_admission_queue_depth", "Requests waiting for a slot by route")
+metrics.REGISTRY.describe("fake_news_admission_active", "Requests holding a slot by route")
+metrics.REGISTRY.describe("fake_news_article_pool_size", "Pre-generated articles ready to serve by category")
+
+
+@app.before_request
+def start_request_timer() -> None:
+    """Record the request start time for latency metrics."""
+    if metrics.enabled():
+        g.request_started = time.perf_counter()
+
+
+@app.after_request
+def record_request_metrics(response: Response) -> Response:
+    """Record route latency and status counters."""
+    started = g.get("request_started")
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        metrics.REGISTRY.observe("fake_news_http_request_seconds", time.perf_counter() - started, route=route)
+        metrics.REGISTRY.inc("fake_news_http_requests_total", route=route, status=str(response.status_code))
+    return response
+
+
+@app.before_request
+def admit_request() -> Optional[Response]:
+    """
+    Hold admission-controlled routes until a slot is free, or shed them with 429.
+    
+    Requests are prioritized by Content-Length, so small bodies overtake large ones.
+    """
+    route = request.url_rule.rule if request.url_rule is not None else None
+    controller = ADMISSION.get(route)
+    if controller is None:
+        return None
+    
+    try:
+        waited = controller.acquire(request.content_length or 0)
+    except Rejected as e:
+        if metrics.enabled():
+            metrics.REGISTRY.inc("fake_news_admission_rejections_total", route=route, reason=e.reason)
+        logger.warning("Rejected %s request (%s)", route, e.reason, extra={"event": "admission_rejected"})
+        response = api_response({"success": False, "error": "Server is busy, please retry later"}, 429)
+        response.headers["Retry-After"] = str(e.retry_after)
+        return response
+    
+    g.admission = (controller, time.perf_counter())
+    if metrics.enabled():
+        metrics.REGISTRY.observe("fake_news_admission_wait_seconds", waited, route=route)
+    return None
+
+
+@app.teardown_request
+def release_admission(error: Optional[BaseException]) -> None:
+    """Free the slot taken by admit_request, even if the route raised."""
+    admission = g.pop("admission", None)
+    if admission is not None:
+        controller, admitted_at = admission
+        controller.release(time.perf_counter() - admitted_at)
+
+
+def hold_admission(response: Response) -> Response:
+    """
+    Keep the current request's admission slot until a streamed response is closed.
+    
+    The WSGI server closes the response when the body is done or the client has gone
+    away, so the slot is released in both cases rather than when the view returns.
+    """
+    admission = g.pop("admission", None)
+    if admission is not None:
+        controller, admitted_at = admission
+        response.call_on_close(lambda: controller.release(time.perf_counter() - admitted_at))
+    return response
+
+
+def _int_option(options: dict, name: str) -> Optional[int]:
+    """Read an optional integer request parameter."""
+    value = options.get(name)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer")
+
+
+@app.route("/metrics")
+def metrics_endpoint() -> Response:
+    """Prometheus scrape endpoint."""
+    if not metrics.enabled():
+        return Response("metrics disabled\n", status=404, mimetype="text/plain")
+    
+    caches = [("detection_cache", detection_cache)]
+    if _detector is not None:
+        caches.append(("paragraph_cache", _detector.paragraph_cache))
+    if near_duplicate_index is not None:
+        caches.append(("near_duplicate_index", near_duplicate_index))
+    for prefix, cache in caches:
+        for name, value in cache.stats().items():
+            if isinstance(value, (int, float)):
+                metrics.REGISTRY.set_gauge(f"fake_news_{prefix}_{name}", value)
+    for route, controller in ADMISSION.items():
+        if controller is not None:
+            stats = controller.stats()
+            metrics.REGISTRY.set_gauge("fake_news_admission_queue_depth", stats["queue_depth"], route=route)
+            metrics.REGISTRY.set_gauge("fake_news_admission_active", stats["active"], route=route)
+    if _article_pool is not None:
+        for name, value in _article_pool.stats().items():
+            if name.startswith("size_"):
+                metrics.REGISTRY.set_gauge("fake_news_article_pool_size", value, category=name[len("size_"):])
+            elif name != "size":
+                metrics.REGISTRY.set_gauge(f"fake_news_article_pool_{name}", value)
+    return Response(metrics.REGISTRY.render(), mimetype="text/plain; version=0.0.4")
 
 
 @app.route("/")
@@ -48,26 +338,87 @@ def api_generate() -> str:
         category = data.get("category", "random")
         
         # Generate fake news
-        article = generator.generate_fake_news(category)
-        
-        # Convert to JSON-serializable format
-        result = {
-            "title": article.title,
-            "content": article.content,
-            "author": article.author,
-            "source": article.source,
-            "publish_date": article.publish_date.strftime("%Y-%m-%d"),
-            "category": article.category,
-            "is_fake": article.is_fake,
-            "confidence_score": article.confidence_score
-        }
+        article = generate_article(category)
         
-        logger.info(f"Generated fake news via API: {article.title[:50]}...")
-        return jsonify({"success": True, "article": result})
+        logger.info("Generated fake news via API: %.50s...", article.title, extra={"event": "api_generate"})
+        return api_response({"success": True, "article": article_to_dict(article)})
         
     except Exception as e:
-        logger.error(f"Error generating fake news via API: {str(e)}")
-        return jsonify({"success": False, "error": str(e)}), 500
+        logger.error("Error generating fake news via API: %s", e)
+        return api_response({"success": False, "error": str(e)}, 500)
+
+
+@app.route("/api/generate/stream", methods=["GET", "POST"])
+def api_generate_stream() -> Response:
+    """
+    API endpoint streaming generated articles as NDJSON.
+    
+    Takes count (required), category, seed and detect from the query string or a JSON
+    body. Each line holds an id and an article, plus its detection when detect is true.
+    A seeded stream contains the same articles as `corpus.py generate <count> --seed
+    <seed>`. Articles are generated, detected and written STREAM_CHUNK_SIZE at a time,
+    so memory does not grow with count; if the client disconnects, the server closes
+    the stream and the remaining articles are never generated.
+    """
+    from corpus import CORPUS_REFERENCE_DATE, GENERATION_SHARD_SIZE, shard_rng
+    
+    body = request.get_json(silent=True) if request.is_json else None
+    options = dict(body) if isinstance(body, dict) else {}
+    options.update(request.args.to_dict())
+    
+    # A shallow copy shares the shared generator's compiled templates but gets its own
+    # rng and reference_date, which seeded streams replace per shard (as corpus.py does)
+    generator = copy.copy(get_generator())
+    category = options.get("category", "random")
+    detect = str(options.get("detect", "")).lower() in ("1", "true", "yes", "on")
+    try:
+        count = _int_option(options, "count")
+        if count is None:
+            raise ValueError("count is required")
+        if not 1 <= count <= MAX_STREAM_COUNT:
+            raise ValueError(f"count must be between 1 and {MAX_STREAM_COUNT}")
+        seed = _int_option(options, "seed")
+        if category != "random" and category not in generator.templates:
+            raise ValueError(f"Invalid category: {category}")
+        selection = parse_selection(body) if detect else None
+    except ValueError as e:
+        return api_response({"success": False, "error": str(e)}, 400)
+    
+    if seed is not None:
+        generator.reference_date = CORPUS_REFERENCE_DATE
+    
+    def stream() -> Iterator[str]:
+        detector = get_detector() if detect else None
+        dumps = app.json.dumps
+        produced = 0
+        try:
+            while produced < count:
+                chunk = []
+                for index in range(produced, min(produced + STREAM_CHUNK_SIZE, count)):
+                    if seed is not None and index % GENERATION_SHARD_SIZE == 0:
+                        generator.rng = shard_rng(seed, index // GENERATION_SHARD_SIZE)
+                    chunk.append(generator.generate_fake_news(category))
+                
+                records = [{"id": index, "article": article_to_dict(article)}
+                           for index, article in enumerate(chunk, produced)]
+                if detector is not None:
+                    items = [{"title": article.title, "content": article.content} for article in chunk]
+                    for record, result in zip(records, detector.detect_batch(items, use_cache=False)):
+                        record["detection"] = detection_to_dict(result, selection)
+                
+                produced += len(chunk)
+                yield "".join(dumps(record) + "\n" for record in records)
+        finally:
+            if produced < count:
+                logger.info("Article stream closed after %d of %d articles", produced, count,
+                            extra={"event": "api_generate_stream_closed"})
+            else:
+                logger.info("Streamed %d articles via API", count, extra={"event": "api_generate_stream"})
+    
+    response = Response(stream_with_context(stream()), mimetype="application/x-ndjson")
+    # Ask reverse proxies to pass chunks through instead of buffering the whole body
+    response.headers["X-Accel-Buffering"] = "no"
+    return hold_admission(response)
 
 
 @app.route("/api/detect", methods=["POST"])
@@ -79,25 +430,119 @@ def api_detect() -> str:
         content = data.get("content", "")
         
         if not content:
-            return jsonify({"success": False, "error": "Content is required"}), 400
+            return api_response({"success": False, "error": "Content is required"}, 400)
+        
+        try:
+            selection = parse_selection(data)
+        except ValueError as e:
+            return api_response({"success": False, "error": str(e)}, 400)
+        
+        # Detect fake news; paragraph mode re-extracts only paragraphs edited since
+        # the last submission and scores each paragraph
+        if data.get("paragraphs"):
+            result = get_detector().detect_paragraphs(content, title)
+        else:
+            result = get_detector().detect_fake_news(content, title)
+        
+        logger.info("Detection completed via API - Score: %.3f", result.confidence_score,
+                    extra={"event": "api_detect"})
+        return api_response({"success": True, "result": detection_to_dict(result, selection)})
+        
+    except Exception as e:
+        logger.error("Error detecting fake news via API: %s", e)
+        return api_response({"success": False, "error": str(e)}, 500)
+
+
+@app.route("/api/detect/batch", methods=["POST"])
+def api_detect_batch() -> str:
+    """API endpoint for detecting fake news in a batch of articles."""
+    try:
+        data = request.get_json()
+        items = data.get("items") if isinstance(data, dict) else data
+        
+        if not isinstance(items, list):
+            return api_response({"success": False, "error": "A list of articles is required"}, 400)
+        
+        if len(items) > MAX_BATCH_SIZE:
+            return api_response({"success": False, "error": f"Batch size exceeds limit of {MAX_BATCH_SIZE}"}, 400)
+        
+        try:
+            selection = parse_selection(data)
+        except ValueError as e:
+            return api_response({"success": False, "error": str(e)}, 400)
+        
+        # Validate every item up front so one bad article doesn't fail the batch
+        results = [None] * len(items)
+        valid_indices = []
+        valid_items = []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                results[index] = {"success": False, "error": "Article must be an object"}
+                continue
+            title = item.get("title") or ""
+            content = item.get("content")
+            if not content or not isinstance(content, str) or not isinstance(title, str):
+                results[index] = {"success": False, "error": "Content is required"}
+                continue
+            valid_indices.append(index)
+            valid_items.append({"title": title, "content": content})
         
         # Detect fake news
-        result = detector.detect_fake_news(content, title)
+        detections = get_detector().detect_batch(valid_items)
         
         # Convert to JSON-serializable format
-        detection_result = {
-            "is_fake": result.is_fake,
-            "confidence_score": result.confidence_score,
-            "explanation": result.explanation,
-            "features": result.features
-        }
+        for index, result in zip(valid_indices, detections):
+            results[index] = {"success": True, "result": detection_to_dict(result, selection)}
         
-        logger.info(f"Detection completed via API - Score: {result.confidence_score:.3f}")
-        return jsonify({"success": True, "result": detection_result})
+        logger.info("Batch detection completed via API - Articles: %d, Valid: %d", len(items), len(valid_items),
+                    extra={"event": "api_detect_batch"})
+        return api_response({"success": True, "results": results})
         
     except Exception as e:
-        logger.error(f"Error detecting fake news via API: {str(e)}")
-        return jsonify({"success": False, "error": str(e)}), 500
+        logger.error("Error detecting fake news batch via API: %s", e)
+        return api_response({"success": False, "error": str(e)}, 500)
+
+
+@app.route("/api/cache/stats")
+def api_cache_stats() -> str:
+    """API endpoint reporting detection cache counters."""
+    near_duplicates = near_duplicate_index.stats() if near_duplicate_index is not None else None
+    return api_response({"success": True, "cache": detection_cache.stats(),
+                         "paragraph_cache": get_detector().paragraph_cache.stats(),
+                         "near_duplicate_index": near_duplicates})
+
+
+@app.route("/api/pool/stats")
+def api_pool_stats() -> str:
+    """API endpoint reporting article pool sizes and hit/miss counters."""
+    pool = get_article_pool()
+    return api_response({"success": True, "enabled": pool is not None,
+                         "pool": pool.stats() if pool is not None else None})
+
+
+@app.route("/api/admin/lexicons/reload", methods=["POST"])
+def api_reload_lexicons() -> str:
+    """
+    API endpoint reloading the lexicon pack of the worker handling the request.
+    
+    Requires "Authorization: Bearer <FAKE_NEWS_ADMIN_TOKEN>". Under a multi-worker server
+    the file watcher is what reaches every worker; this endpoint forces an immediate
+    reload where watching is disabled or too slow.
+    """
+    supplied = request.headers.get("Authorization", "")
+    if not ADMIN_TOKEN or not hmac.compare_digest(supplied, f"Bearer {ADMIN_TOKEN}"):
+        return api_response({"success": False, "error": "Forbidden"}, 403)
+    detector = get_detector()
+    if detector.lexicon_pack is None:
+        return api_response({"success": False, "error": "No lexicon pack configured"}, 400)
+    
+    try:
+        detector.load_lexicons(detector.lexicon_pack)
+        return api_response({"success": True, "lexicon_pack": detector.lexicon_pack,
+                             "fingerprint": detector.fingerprint})
+    except Exception as e:
+        logger.error("Error reloading lexicon pack via API: %s", e)
+        return api_response({"success": False, "error": str(e)}, 500)
 
 
 @app.route("/api/generate-and-detect", methods=["POST"])
@@ -107,41 +552,34 @@ def api_generate_and_detect() -> str:
         data = request.get_json()
         category = data.get("category", "random")
         
+        try:
+            selection = parse_selection(data)
+        except ValueError as e:
+            return api_response({"success": False, "error": str(e)}, 400)
+        
         # Generate fake news
-        article = generator.generate_fake_news(category)
+        article = generate_article(category)
         
         # Detect fake news
-        detection_result = detector.detect_fake_news(article.content, article.title)
+        detection_result = get_detector().detect_fake_news(article.content, article.title)
         
         # Check if detection was correct
         detection_correct = detection_result.is_fake == article.is_fake
         
         # Convert to JSON-serializable format
         result = {
-            "article": {
-                "title": article.title,
-                "content": article.content,
-                "author": article.author,
-                "source": article.source,
-                "publish_date": article.publish_date.strftime("%Y-%m-%d"),
-                "category": article.category,
-                "is_fake": article.is_fake
-            },
-            "detection": {
-                "is_fake": detection_result.is_fake,
-                "confidence_score": detection_result.confidence_score,
-                "explanation": detection_result.explanation,
-                "features": detection_result.features
-            },
+            "article": article_to_dict(article, include_confidence=False),
+            "detection": detection_to_dict(detection_result, selection),
             "detection_correct": detection_correct
         }
         
-        logger.info(f"Generate and detect completed - Detection correct: {detection_correct}")
-        return jsonify({"success": True, "result": result})
+        logger.info("Generate and detect completed - Detection correct: %s", detection_correct,
+                    extra={"event": "api_generate_and_detect"})
+        return api_response({"success": True, "result": result})
         
     except Exception as e:
-        logger.error(f"Error in generate and detect via API: {str(e)}")
-        return jsonify({"success": False, "error": str(e)}), 500
+        logger.error("Error in generate and detect via API: %s", e)
+        return api_response({"success": False, "error": str(e)}, 500)
 
 
 if __name__ == "__main__":
@@ -152,5 +590,9 @@ if __name__ == "__main__":
     print("🛑 Press Ctrl+C to stop the server")
     print("=" * 50)
     
+    configure_logging()
+    warm_up()
+    start_lexicon_watcher()
+    
     # Run the Flask app
     app.run(host="0.0.0.0", port=5000, debug=True) 
\ No newline at end of file
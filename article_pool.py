@@ -0,0 +1,188 @@
+"""
+Pre-generated article pool for the fake news web API.
+Bounded per-category ring buffers of generated articles, topped up by a background thread.
+
+A request takes an article from its category's buffer in O(1) and only falls back to
+inline generation when the buffer is empty (a miss). Whenever a buffer drops below the
+low-water mark the refill thread is woken and fills it back to capacity, generating at
+most refill_rate articles per second so it does not starve request threads; buffers at
+or above the mark are left alone until they drain below it.
+
+Threads do not survive fork: start() is called again in every worker process, where it
+drops articles inherited from the parent and reseeds the pool's random streams, so
+workers never hand out the same articles.
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from main import FakeNewsGenerator, NewsArticle
+
+logger = logging.getLogger(__name__)
+
+# Defaults, overridable through FAKE_NEWS_POOL_* environment variables
+DEFAULT_CAPACITY = 128
+DEFAULT_REFILL_RATE = 1000.0
+
+# Seconds the refill thread sleeps between checks when nothing woke it
+_IDLE_INTERVAL = 1.0
+
+
+class ArticlePool:
+    """
+    Per-category article buffers with hit/miss counters and a refill thread.
+    All operations are guarded by a lock and safe to call from multiple threads.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, low_water: Optional[int] = None,
+                 refill_rate: float = DEFAULT_REFILL_RATE) -> None:
+        """
+        Initialize an empty pool; call start() to begin filling it.
+
+        Args:
+            capacity: Articles kept per category
+            low_water: Buffer size below which a refill is triggered (defaults to capacity // 2,
+                clamped to 1..capacity)
+            refill_rate: Articles generated per second at most (0 for no limit)
+        """
+        if capacity < 1:
+            raise ValueError(f"Invalid pool capacity: {capacity}")
+
+        # The refill thread owns this generator; the shared one is left to request threads
+        self._generator = FakeNewsGenerator()
+        self.categories = tuple(self._generator.templates)
+        self.capacity = capacity
+        self.low_water = max(1, min(capacity // 2 if low_water is None else low_water, capacity))
+        self.refill_rate = refill_rate
+        self._buffers: Dict[str, Deque[NewsArticle]] = {
+            category: deque(maxlen=capacity) for category in self.categories
+        }
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        # Picks the category of "random" requests, apart from the global random module
+        self._rng = random.Random()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["ArticlePool"]:
+        """
+        Build a pool from FAKE_NEWS_POOL_SIZE, FAKE_NEWS_POOL_LOW_WATER and FAKE_NEWS_POOL_REFILL_RATE.
+
+        Returns:
+            The pool, or None when FAKE_NEWS_POOL_SIZE is 0 (pooling disabled)
+        """
+        capacity = int(os.environ.get("FAKE_NEWS_POOL_SIZE", str(DEFAULT_CAPACITY)))
+        if capacity <= 0:
+            return None
+        low_water = os.environ.get("FAKE_NEWS_POOL_LOW_WATER")
+        return cls(capacity, int(low_water) if low_water else None,
+                   float(os.environ.get("FAKE_NEWS_POOL_REFILL_RATE", str(DEFAULT_REFILL_RATE))))
+
+    def get(self, category: str = "random") -> Optional[NewsArticle]:
+        """
+        Take a pre-generated article.
+
+        Args:
+            category: Article category, or "random" for any category
+
+        Returns:
+            An article, or None on a miss (empty buffer or unknown category)
+        """
+        with self._lock:
+            if category == "random":
+                category = self._rng.choice(self.categories)
+            buffer = self._buffers.get(category)
+            if buffer is None:
+                return None
+            article = buffer.popleft() if buffer else None
+            if article is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            refill = len(buffer) < self.low_water
+        if refill:
+            self._wake.set()
+        return article
+
+    def start(self) -> None:
+        """
+        Start the refill thread in this process.
+
+        Calls in a process that already runs the thread are no-ops. In a forked child,
+        inherited articles are dropped and the random streams are reseeded first.
+        """
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+                return
+            if self._pid is not None and self._pid != os.getpid():
+                for buffer in self._buffers.values():
+                    buffer.clear()
+            self._generator.rng = random.Random()
+            self._rng = random.Random()
+            self._pid = os.getpid()
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="article-pool-refill", daemon=True)
+            self._thread.start()
+        self._wake.set()
+
+    def stop(self) -> None:
+        """Stop the refill thread."""
+        self._stopped.set()
+        self._wake.set()
+
+    def _run(self) -> None:
+        interval = 1.0 / self.refill_rate if self.refill_rate > 0 else 0.0
+        next_at = time.monotonic()
+        while not self._stopped.is_set():
+            self._wake.wait(_IDLE_INTERVAL)
+            self._wake.clear()
+            for category, buffer in self._buffers.items():
+                # Only buffers that drained below the mark are topped up, back to capacity
+                if len(buffer) >= self.low_water:
+                    continue
+                while len(buffer) < self.capacity and not self._stopped.is_set():
+                    if interval:
+                        # Pace generation; idle time does not accumulate into a burst
+                        now = time.monotonic()
+                        next_at = max(next_at + interval, now)
+                        if next_at > now:
+                            time.sleep(next_at - now)
+                    try:
+                        article = self._generator.generate_fake_news(category)
+                    except Exception as e:
+                        logger.error("Error refilling article pool: %s", e)
+                        break
+                    with self._lock:
+                        buffer.append(article)
+                        self.generated += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Snapshot of buffer sizes, limits and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "capacity": self.capacity,
+                "low_water": self.low_water,
+                "refill_rate": self.refill_rate,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "generated": self.generated,
+                "size": sum(len(buffer) for buffer in self._buffers.values())
+            }
+            for category, buffer in self._buffers.items():
+                stats[f"size_{category}"] = len(buffer)
+        return stats
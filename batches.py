@@ -0,0 +1,255 @@
+"""
+Columnar article and detection batches for bulk workloads.
+Struct-of-arrays containers that hold large corpora and result sets without a Python object per row.
+
+Titles and contents live in a StringColumn: one shared string plus an offsets array.
+Low-cardinality strings (authors, sources, categories, explanations) are dictionary
+encoded in a CategoryColumn, and numbers are NumPy arrays. A DetectionBatch keeps the
+features as a single float32 (N x F) matrix in FEATURE_NAMES column order.
+
+Rows are only materialized on request, as SlottedNewsArticle / SlottedDetectionResult.
+Batches are produced by FakeNewsGenerator.generate_batch and consumed by
+FakeNewsDetector.detect_articles.
+
+Requires NumPy.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from main import FEATURE_NAMES, SlottedDetectionResult, SlottedNewsArticle
+
+
+class StringColumn:
+    """
+    Strings stored back to back in one shared string.
+
+    Row i is data[offsets[i]:offsets[i + 1]].
+    """
+
+    __slots__ = ("data", "offsets")
+
+    def __init__(self, data: str, offsets: np.ndarray) -> None:
+        self.data = data
+        self.offsets = offsets
+
+    @classmethod
+    def from_strings(cls, strings: Sequence[str]) -> "StringColumn":
+        """Pack a sequence of strings."""
+        offsets = np.zeros(len(strings) + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, strings), dtype=np.int64, count=len(strings)), out=offsets[1:])
+        return cls("".join(strings), offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        return self.data[self.offsets[index]:self.offsets[index + 1]]
+
+    def __iter__(self) -> Iterator[str]:
+        data = self.data
+        offsets = self.offsets.tolist()
+        for start, end in zip(offsets, offsets[1:]):
+            yield data[start:end]
+
+    def take(self, rows: np.ndarray) -> "StringColumn":
+        """Select a subset of rows, in the given order."""
+        return StringColumn.from_strings([self[row] for row in rows.tolist()])
+
+
+class CategoryColumn:
+    """
+    Dictionary-encoded strings: a tuple of distinct values and one code per row.
+    """
+
+    __slots__ = ("values", "codes")
+
+    def __init__(self, values: Tuple[str, ...], codes: np.ndarray) -> None:
+        self.values = values
+        self.codes = codes
+
+    @classmethod
+    def from_strings(cls, strings: Sequence[str]) -> "CategoryColumn":
+        """Encode a sequence of strings; values keep their first-seen order."""
+        index: Dict[str, int] = {}
+        codes = np.fromiter(
+            (index.setdefault(value, len(index)) for value in strings), dtype=np.int32, count=len(strings)
+        )
+        return cls(tuple(index), codes)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> str:
+        return self.values[self.codes[index]]
+
+    def __iter__(self) -> Iterator[str]:
+        values = self.values
+        return (values[code] for code in self.codes.tolist())
+
+    def take(self, rows: np.ndarray) -> "CategoryColumn":
+        """Select a subset of rows, in the given order."""
+        return CategoryColumn(self.values, self.codes[rows])
+
+
+class ArticleBatch:
+    """
+    Articles in struct-of-arrays form.
+
+    Column i of every field belongs to the same article. Publish dates are
+    datetime64[us], labels a bool array and generator confidences float64.
+    """
+
+    __slots__ = (
+        "titles", "contents", "authors", "sources",
+        "publish_dates", "categories", "is_fake", "confidence_scores"
+    )
+
+    def __init__(self, titles: StringColumn, contents: StringColumn, authors: CategoryColumn,
+                 sources: CategoryColumn, publish_dates: np.ndarray, categories: CategoryColumn,
+                 is_fake: np.ndarray, confidence_scores: np.ndarray) -> None:
+        self.titles = titles
+        self.contents = contents
+        self.authors = authors
+        self.sources = sources
+        self.publish_dates = publish_dates
+        self.categories = categories
+        self.is_fake = is_fake
+        self.confidence_scores = confidence_scores
+
+    @classmethod
+    def from_columns(cls, titles: Sequence[str], contents: Sequence[str], authors: Sequence[str],
+                     sources: Sequence[str], publish_dates: Sequence[datetime], categories: Sequence[str],
+                     is_fake: Sequence[bool], confidence_scores: Sequence[float]) -> "ArticleBatch":
+        """
+        Build a batch from per-field sequences of equal length.
+
+        Returns:
+            ArticleBatch holding copies of the columns
+        """
+        return cls(
+            StringColumn.from_strings(titles),
+            StringColumn.from_strings(contents),
+            CategoryColumn.from_strings(authors),
+            CategoryColumn.from_strings(sources),
+            np.array(publish_dates, dtype="datetime64[us]").reshape(len(titles)),
+            CategoryColumn.from_strings(categories),
+            np.array(is_fake, dtype=bool).reshape(len(titles)),
+            np.array(confidence_scores, dtype=np.float64).reshape(len(titles))
+        )
+
+    @classmethod
+    def from_articles(cls, articles: Iterable) -> "ArticleBatch":
+        """Build a batch from NewsArticle-like objects."""
+        articles = list(articles)
+        return cls.from_columns(
+            [article.title for article in articles],
+            [article.content for article in articles],
+            [article.author for article in articles],
+            [article.source for article in articles],
+            [article.publish_date for article in articles],
+            [article.category for article in articles],
+            [article.is_fake for article in articles],
+            [article.confidence_score for article in articles]
+        )
+
+    def __len__(self) -> int:
+        return len(self.is_fake)
+
+    def __getitem__(self, index: int) -> SlottedNewsArticle:
+        return SlottedNewsArticle(
+            title=self.titles[index],
+            content=self.contents[index],
+            author=self.authors[index],
+            source=self.sources[index],
+            publish_date=self.publish_dates[index].item(),
+            category=self.categories[index],
+            is_fake=bool(self.is_fake[index]),
+            confidence_score=float(self.confidence_scores[index])
+        )
+
+    def __iter__(self) -> Iterator[SlottedNewsArticle]:
+        return (self[index] for index in range(len(self)))
+
+    def texts(self, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+        """
+        Combined title and content of a range of rows, as analyzed by the detector.
+
+        Args:
+            start: First row
+            stop: Row after the last one (defaults to the end of the batch)
+
+        Yields:
+            f"{title} {content}".strip() for every row
+        """
+        stop = len(self) if stop is None else stop
+        titles, contents = self.titles, self.contents
+        for index in range(start, stop):
+            yield f"{titles[index]} {contents[index]}".strip()
+
+    def take(self, rows: np.ndarray) -> "ArticleBatch":
+        """Select a subset of rows, in the given order."""
+        return ArticleBatch(
+            self.titles.take(rows), self.contents.take(rows), self.authors.take(rows),
+            self.sources.take(rows), self.publish_dates[rows], self.categories.take(rows),
+            self.is_fake[rows], self.confidence_scores[rows]
+        )
+
+
+class DetectionBatch:
+    """
+    Detection results in struct-of-arrays form.
+
+    Scores are float32, verdicts a bool array and features one (N x F) float32 matrix
+    whose columns follow FEATURE_NAMES. Explanations are dictionary encoded, since a
+    batch only ever contains a handful of distinct ones.
+    """
+
+    __slots__ = ("is_fake", "confidence_scores", "features", "explanations")
+
+    def __init__(self, is_fake: np.ndarray, confidence_scores: np.ndarray, features: np.ndarray,
+                 explanations: CategoryColumn) -> None:
+        self.is_fake = is_fake
+        self.confidence_scores = confidence_scores
+        self.features = features
+        self.explanations = explanations
+
+    @classmethod
+    def from_results(cls, results: Iterable) -> "DetectionBatch":
+        """Build a batch from DetectionResult-like objects."""
+        results = list(results)
+        features = np.array(
+            [[result.features.get(name, 0.0) for name in FEATURE_NAMES] for result in results], dtype=np.float32
+        ).reshape(len(results), len(FEATURE_NAMES))
+        return cls(
+            np.array([result.is_fake for result in results], dtype=bool).reshape(len(results)),
+            np.array([result.confidence_score for result in results], dtype=np.float32).reshape(len(results)),
+            features,
+            CategoryColumn.from_strings([result.explanation for result in results])
+        )
+
+    def __len__(self) -> int:
+        return len(self.is_fake)
+
+    def __getitem__(self, index: int) -> SlottedDetectionResult:
+        return SlottedDetectionResult(
+            is_fake=bool(self.is_fake[index]),
+            confidence_score=float(self.confidence_scores[index]),
+            features=dict(zip(FEATURE_NAMES, self.features[index].tolist())),
+            explanation=self.explanations[index]
+        )
+
+    def __iter__(self) -> Iterator[SlottedDetectionResult]:
+        return (self[index] for index in range(len(self)))
+
+    def feature(self, name: str) -> np.ndarray:
+        """Column of one feature (a view into the feature matrix)."""
+        return self.features[:, FEATURE_NAMES.index(name)]
+
+    def take(self, rows: np.ndarray) -> "DetectionBatch":
+        """Select a subset of rows, in the given order."""
+        return DetectionBatch(
+            self.is_fake[rows], self.confidence_scores[rows], self.features[rows], self.explanations.take(rows)
+        )
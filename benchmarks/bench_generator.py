@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for FakeNewsGenerator.generate_fake_news.
+Reports articles per second for every category using a seeded generator.
+
+Usage:
+    python benchmarks/bench_generator.py [--articles 20000] [--repeat 5]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import FakeNewsGenerator  # noqa: E402
+
+CATEGORIES = ("conspiracy", "sensational", "clickbait", "random")
+
+
+def bench_category(category: str, articles: int, repeat: int) -> float:
+    """Return the best articles-per-second rate over `repeat` runs."""
+    generator = FakeNewsGenerator(rng=random.Random(0), reference_date=datetime(2024, 1, 1))
+    generate = generator.generate_fake_news
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(articles):
+            generate(category)
+        best = min(best, time.perf_counter() - started)
+    return articles / best
+
+
+def main() -> None:
+    """Run the benchmark and print one line per category."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=20000, help="Articles generated per run")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per category (best is reported)")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    for category in CATEGORIES:
+        rate = bench_category(category, args.articles, args.repeat)
+        print(f"{category:<12} {rate:>12,.0f} articles/s")
+
+
+if __name__ == "__main__":
+    main()
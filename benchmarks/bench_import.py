@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Import-time budget check for the detector and web app modules.
+Times `import main` and `import app` in fresh interpreters and fails when either goes over budget.
+
+Usage:
+    python benchmarks/bench_import.py                      # default budgets
+    python benchmarks/bench_import.py --budget app=0.3 --repeat 9
+    python benchmarks/bench_import.py --profile            # also list the slowest imports
+
+Each module is imported in a new interpreter per run and the median wall time is
+compared with its budget (in seconds). Importing app must also leave the generator and
+detector unbuilt, since they are constructed lazily. The exit status is 1 on any failure.
+Budgets are machine specific; set them for the machine that runs the gate.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Default budget per module, in seconds
+DEFAULT_BUDGETS = {"main": 0.15, "app": 0.5}
+
+# Timed in the child: import the module, then report the elapsed time and whether app
+# built its engine objects during import
+_TIMER = """
+import sys, time
+started = time.perf_counter()
+module = __import__(sys.argv[1])
+elapsed = time.perf_counter() - started
+eager = getattr(module, "_generator", None) is not None or getattr(module, "_detector", None) is not None
+print(elapsed, int(eager))
+"""
+
+
+def time_import(module: str) -> Tuple[float, bool]:
+    """
+    Import a module in a fresh interpreter.
+
+    Returns:
+        Tuple of (seconds spent importing, whether engine objects were built eagerly)
+    """
+    output = subprocess.run(
+        [sys.executable, "-c", _TIMER, module], cwd=ROOT, check=True, capture_output=True, text=True
+    ).stdout.split()
+    return float(output[0]), output[1] == "1"
+
+
+def slowest_imports(module: str, limit: int) -> List[Tuple[int, str]]:
+    """
+    Profile an import with -X importtime.
+
+    Returns:
+        (cumulative microseconds, module name) of the slowest imports, slowest first
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=ROOT, check=True,
+        capture_output=True, text=True
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            rows.append((int(parts[1]), parts[2].rstrip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def parse_budgets(values: List[str]) -> Dict[str, float]:
+    """Parse module=seconds overrides on top of DEFAULT_BUDGETS."""
+    budgets = dict(DEFAULT_BUDGETS)
+    for value in values:
+        module, _, seconds = value.partition("=")
+        budgets[module] = float(seconds)
+    return budgets
+
+
+def main() -> int:
+    """Run the check and print one line per module."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget", action="append", default=[], metavar="MODULE=SECONDS",
+                        help="Budget override (repeatable)")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per module (median is used)")
+    parser.add_argument("--profile", action="store_true", help="List the slowest imports of every module")
+    parser.add_argument("--top", type=int, default=10, help="Imports listed by --profile")
+    args = parser.parse_args()
+
+    failures = []
+    for module, budget in parse_budgets(args.budget).items():
+        runs = [time_import(module) for _ in range(args.repeat)]
+        median = statistics.median(seconds for seconds, _ in runs)
+        eager = any(built for _, built in runs)
+        status = "ok" if median <= budget and not eager else "FAIL"
+        print(f"{module:<8} {median * 1000:>8.1f} ms  (budget {budget * 1000:.0f} ms)  {status}")
+        if median > budget:
+            failures.append(f"import {module} took {median * 1000:.1f} ms, over its {budget * 1000:.0f} ms budget")
+        if eager:
+            failures.append(f"import {module} built the generator or detector eagerly")
+        if args.profile or median > budget:
+            for micros, name in slowest_imports(module, args.top):
+                print(f"    {micros / 1000:>8.1f} ms  {name}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the fake news generator, detector and HTTP endpoints.
+Writes machine-readable results and gates them against a stored baseline.
+
+Usage:
+    python benchmarks/suite.py                           # run, compare with benchmarks/baseline.json
+    python benchmarks/suite.py --output results.json     # also write results
+    python benchmarks/suite.py --save-baseline           # record a new baseline
+    python benchmarks/suite.py --threshold 0.15 --threshold detector/1mb=0.3
+
+The suites run ROUNDS times in turn, each round with an equal share of the budget, and
+every benchmark reports the best of its per-round figures (highest throughput, lowest
+latencies): noise only ever slows a round down, so the best round is the least disturbed
+one, and interleaving spreads a benchmark's rounds over the whole run instead of letting
+one busy stretch cover all of them. A benchmark regresses when its best throughput
+drops, or its best p99 latency grows, by more than its threshold (a fraction of the baseline value); p99 is only gated for
+operations whose baseline p50 is at least TAIL_GATE_MIN_MS, since the tail of faster
+calls is dominated by scheduler and GC noise. The exit status is 1 on any regression.
+Baselines are machine specific; record them on the machine that runs the gate, and
+again whenever a change alters a measured code path on purpose. Every report records the
+commit it was measured at (suffixed with +dirty for uncommitted changes).
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from main import FakeNewsDetector, FakeNewsGenerator  # noqa: E402
+
+# Default baseline location
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+# Default allowed regression, as a fraction of the baseline value
+DEFAULT_THRESHOLD = 0.25
+
+# Interleaved measurement rounds; reported figures are the best of the rounds
+ROUNDS = 10
+
+# p99 latency is only gated for operations whose baseline p50 is at least this long
+TAIL_GATE_MIN_MS = 0.1
+
+CATEGORIES = ("conspiracy", "sensational", "clickbait", "random")
+
+# Detector input sizes: (benchmark name, approximate size, unit)
+DETECTOR_INPUTS = (
+    ("detector/100w", 100, "words"),
+    ("detector/1kw", 1000, "words"),
+    ("detector/10kw", 10000, "words"),
+    ("detector/1mb", 1024 * 1024, "bytes")
+)
+
+
+def measure(fn: Callable[[int], None], min_iterations: int, min_seconds: float,
+            max_iterations: int = 1000000) -> Dict[str, float]:
+    """
+    Call fn(i) repeatedly and summarize per-call latency.
+
+    Runs at least min_iterations calls and keeps going until min_seconds have elapsed,
+    up to max_iterations.
+
+    Returns:
+        Dict with iterations, ops_per_sec, mean/p50/p90/p99/max latency in milliseconds
+    """
+    fn(0)  # warm-up
+    latencies: List[float] = []
+    clock = time.perf_counter
+    started = clock()
+    iteration = 0
+    while iteration < max_iterations and (iteration < min_iterations or clock() - started < min_seconds):
+        call_started = clock()
+        fn(iteration)
+        latencies.append(clock() - call_started)
+        iteration += 1
+    elapsed = clock() - started
+
+    latencies.sort()
+
+    def percentile(q: float) -> float:
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+
+    return {
+        "iterations": len(latencies),
+        "ops_per_sec": len(latencies) / elapsed,
+        "mean_ms": sum(latencies) / len(latencies) * 1000,
+        "p50_ms": percentile(0.50),
+        "p90_ms": percentile(0.90),
+        "p99_ms": percentile(0.99),
+        "max_ms": latencies[-1] * 1000
+    }
+
+
+def combine(rounds: List[Dict[str, Dict[str, float]]]) -> Dict[str, Dict[str, float]]:
+    """
+    Merge the results of several rounds.
+
+    Returns:
+        Per benchmark: the best of every per-round figure (highest throughput, lowest
+        latencies), the number of rounds and the total number of iterations
+    """
+    combined = {}
+    for name in rounds[0]:
+        runs = [results[name] for results in rounds]
+        summary = {figure: min(run[figure] for run in runs) for figure in runs[0]}
+        summary["ops_per_sec"] = max(run["ops_per_sec"] for run in runs)
+        summary["iterations"] = sum(run["iterations"] for run in runs)
+        combined[name] = {"rounds": len(runs), **summary}
+    return combined
+
+
+def _corpus_text(generator: FakeNewsGenerator, size: int, unit: str) -> str:
+    """Concatenate generated articles until the text reaches the requested size."""
+    parts: List[str] = []
+    words = 0
+    length = 0
+    while (words if unit == "words" else length) < size:
+        article = generator.generate_fake_news()
+        parts.append(article.content)
+        words += len(article.content.split())
+        length += len(article.content) + 1
+    text = " ".join(parts)
+    if unit == "words":
+        return " ".join(text.split()[:size])
+    return text[:size]
+
+
+def bench_generator(scale: float) -> Dict[str, Dict[str, float]]:
+    """Benchmark generate_fake_news for every category."""
+    results = {}
+    for category in CATEGORIES:
+        generator = FakeNewsGenerator(rng=random.Random(0), reference_date=datetime(2024, 1, 1))
+        results[f"generator/{category}"] = measure(
+            lambda _, c=category: generator.generate_fake_news(c), int(5000 * scale), 1.0 * scale
+        )
+    return results
+
+
+def bench_detector(scale: float) -> Dict[str, Dict[str, float]]:
+    """Benchmark detect_fake_news from 100 words up to 1 MB of text."""
+    generator = FakeNewsGenerator(rng=random.Random(1), reference_date=datetime(2024, 1, 1))
+    detector = FakeNewsDetector()
+    results = {}
+    for name, size, unit in DETECTOR_INPUTS:
+        text = _corpus_text(generator, size, unit)
+        min_iterations = max(5, int(2000 * scale * 100 / max(len(text.split()), 100)))
+        results[name] = measure(lambda _, t=text: detector.detect_fake_news(t), min_iterations, 1.0 * scale)
+    return results
+
+
+def bench_http(scale: float) -> Dict[str, Dict[str, float]]:
+    """Benchmark the JSON API through the Flask test client."""
+    try:
+        import app as web
+    except ImportError as e:
+        print(f"skipping HTTP benchmarks: {e}", file=sys.stderr)
+        return {}
+
+    web.warm_up()
+    client = web.app.test_client()
+    requests = int(2000 * scale)
+
+    generator = FakeNewsGenerator(rng=random.Random(2), reference_date=datetime(2024, 1, 1))
+    bodies = []
+    for _ in range(requests + 1):
+        article = generator.generate_fake_news()
+        bodies.append({"title": article.title, "content": article.content})
+
+    def post(path: str, body: Dict) -> None:
+        response = client.post(path, json=body)
+        if response.status_code != 200:
+            raise RuntimeError(f"{path} returned {response.status_code}")
+
+    # The result cache is detached while /api/detect is timed, so every call (warm-up and
+    # repeated bodies included) measures detection rather than a cache hit
+    detector = web.get_detector()
+    cache, detector.cache = detector.cache, None
+    try:
+        detect = measure(lambda i: post("/api/detect", bodies[i % len(bodies)]), requests, 1.0 * scale)
+    finally:
+        detector.cache = cache
+
+    return {
+        "http/api_detect": detect,
+        "http/api_generate": measure(lambda _: post("/api/generate", {"category": "random"}), requests, 1.0 * scale),
+        "http/api_generate_and_detect": measure(
+            lambda _: post("/api/generate-and-detect", {"category": "random"}), requests, 1.0 * scale
+        )
+    }
+
+
+SUITES = {
+    "generator": bench_generator,
+    "detector": bench_detector,
+    "http": bench_http
+}
+
+
+def current_commit() -> Optional[str]:
+    """
+    Commit of the working tree being measured.
+
+    Returns:
+        Abbreviated commit hash, suffixed with +dirty when tracked files are modified,
+        or None outside a git checkout
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, check=True,
+                                capture_output=True, text=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT, check=True,
+                               capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{commit}+dirty" if dirty else commit
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            default_threshold: float, thresholds: Dict[str, float]) -> List[str]:
+    """
+    Compare results with a baseline.
+
+    Returns:
+        Human-readable descriptions of every regression
+    """
+    regressions = []
+    for name, current in sorted(results.items()):
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        threshold = thresholds.get(name, default_threshold)
+        throughput_change = current["ops_per_sec"] / reference["ops_per_sec"] - 1
+        tail_change = 0.0
+        if reference["p50_ms"] >= TAIL_GATE_MIN_MS:
+            tail_change = current["p99_ms"] / reference["p99_ms"] - 1
+        if throughput_change < -threshold:
+            regressions.append(f"{name}: throughput {throughput_change:+.1%} "
+                               f"({reference['ops_per_sec']:,.1f} -> {current['ops_per_sec']:,.1f} ops/s)")
+        if tail_change > threshold:
+            regressions.append(f"{name}: p99 {tail_change:+.1%} "
+                               f"({reference['p99_ms']:.3f} -> {current['p99_ms']:.3f} ms)")
+    return regressions
+
+
+def _parse_thresholds(values: List[str]) -> Tuple[float, Dict[str, float]]:
+    """Split --threshold values into the default and per-benchmark overrides."""
+    default = DEFAULT_THRESHOLD
+    overrides = {}
+    for value in values:
+        if "=" in value:
+            name, threshold = value.split("=", 1)
+            overrides[name] = float(threshold)
+        else:
+            default = float(value)
+    return default, overrides
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the suite, write results and apply the regression gate."""
+    parser = argparse.ArgumentParser(description="Benchmark suite with regression gates")
+    parser.add_argument("--suite", action="append", choices=sorted(SUITES),
+                        help="Suites to run (default: all); may be repeated")
+    parser.add_argument("--scale", type=float, default=1.0, help="Scale iteration counts and run times")
+    parser.add_argument("--rounds", type=int, default=ROUNDS,
+                        help=f"Interleaved rounds sharing the budget; figures are the best round's (default {ROUNDS})")
+    parser.add_argument("--output", help="Write results JSON to this file (- for stdout)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--threshold", action="append", default=[],
+                        help=f"Allowed regression fraction (default {DEFAULT_THRESHOLD}), or NAME=FRACTION")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.INFO)
+    rounds = []
+    for _ in range(max(1, args.rounds)):
+        round_results: Dict[str, Dict[str, float]] = {}
+        for suite in args.suite or sorted(SUITES):
+            round_results.update(SUITES[suite](args.scale / max(1, args.rounds)))
+        rounds.append(round_results)
+    results = combine(rounds)
+
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "commit": current_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "scale": args.scale,
+            "rounds": len(rounds)
+        },
+        "results": results
+    }
+
+    for name, result in sorted(results.items()):
+        print(f"{name:<32} {result['ops_per_sec']:>12,.1f} ops/s   "
+              f"p50 {result['p50_ms']:>9.3f} ms   p99 {result['p99_ms']:>9.3f} ms", file=sys.stderr)
+
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    elif args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+            handle.write("\n")
+        print(f"baseline written to {args.baseline}", file=sys.stderr)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; skipping regression gate", file=sys.stderr)
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as handle:
+        stored = json.load(handle)
+    baseline = stored["results"]
+    print(f"comparing with baseline measured at {stored['meta'].get('commit') or 'an unknown commit'}",
+          file=sys.stderr)
+    default_threshold, thresholds = _parse_thresholds(args.threshold)
+    regressions = compare(results, baseline, default_threshold, thresholds)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    if not regressions:
+        print("no regressions against baseline", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+Detection result cache for the fake news detector.
+A bounded, thread-safe LRU cache with TTL expiry keyed on a hash of the normalized article text.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+# Default number of cached results
+DEFAULT_MAX_SIZE = 10000
+
+# Default entry lifetime in seconds (None disables expiry)
+DEFAULT_TTL = 3600.0
+
+
+def content_key(full_text: str, fingerprint: str = "") -> Tuple[str, str]:
+    """
+    Build a cache key for an article.
+
+    Whitespace runs are collapsed before hashing; detection features depend only on
+    tokens and punctuation, so texts that differ only in spacing share a result.
+
+    Args:
+        full_text: Combined title and content as analyzed by the detector
+        fingerprint: Fingerprint of the detector configuration (lexicons and weights)
+
+    Returns:
+        Tuple of (fingerprint, content digest)
+    """
+    normalized = " ".join(full_text.split())
+    digest = hashlib.blake2b(normalized.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+    return fingerprint, digest
+
+
+class DetectionCache:
+    """
+    Bounded LRU cache with optional TTL and hit/miss/eviction counters.
+    All operations are guarded by a lock and safe to call from multiple threads.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE, ttl: Optional[float] = DEFAULT_TTL) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of entries kept before the least recently used is evicted
+            ttl: Seconds an entry stays valid (None or 0 keeps entries until evicted)
+        """
+        if max_size < 1:
+            raise ValueError(f"Invalid cache size: {max_size}")
+
+        self.max_size = max_size
+        self.ttl = ttl or None
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up a cached value and mark it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None on a miss or an expired entry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting the least recently used entries if the cache is full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        expires_at = time.monotonic() + self.ttl if self.ttl else 0.0
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Snapshot of the cache counters.
+
+        Returns:
+            Dict with size, capacity, hit/miss/eviction/expiration counts and hit ratio
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_ratio": self.hits / lookups if lookups else 0.0
+            }
@@ -0,0 +1,367 @@
+"""
+Corpus-level batch jobs for the fake news detector.
+Non-interactive command line tools for generating and scoring large JSONL corpora across all CPU cores.
+
+Usage:
+    python corpus.py generate 100000 --seed 42 -o articles.jsonl
+    python corpus.py score articles.jsonl -o scores.jsonl --workers 16
+    cat articles.jsonl | python corpus.py score - --ordered
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import datetime
+from itertools import islice
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple
+
+from main import FakeNewsDetector, FakeNewsGenerator, NewsArticle
+
+# Number of input lines handed to a worker at a time
+DEFAULT_CHUNK_SIZE = 256
+
+# Articles generated per RNG stream; fixed so output does not depend on the worker count
+GENERATION_SHARD_SIZE = 1000
+
+# Publish dates of generated corpora count back from this date, keeping them reproducible
+CORPUS_REFERENCE_DATE = datetime(2024, 1, 1)
+
+# Chunks allowed in flight per worker; bounds memory independently of input size
+IN_FLIGHT_PER_WORKER = 2
+
+# Detector owned by each worker process, built once by _init_worker
+_worker_detector: Optional[FakeNewsDetector] = None
+
+# Generator owned by each worker process, built once by _generate_shard
+_worker_generator: Optional[FakeNewsGenerator] = None
+
+
+def _init_worker() -> None:
+    """Build the per-process detector used by _score_chunk."""
+    global _worker_detector
+    _worker_detector = FakeNewsDetector()
+
+
+def _score_chunk(first_line: int, lines: List[str], include_features: bool) -> Tuple[str, int, int]:
+    """
+    Score a chunk of JSONL article records inside a worker process.
+
+    Args:
+        first_line: Line number of the first line in the chunk (1-based)
+        lines: Raw JSONL lines, each an object with "content" and optional "title" and "id"
+        include_features: Include the feature dict in every output record
+
+    Returns:
+        Tuple of (serialized JSONL output, records scored, records with errors)
+    """
+    detector = _worker_detector
+    if detector is None:
+        _init_worker()
+        detector = _worker_detector
+
+    slots: List[Optional[Dict]] = []
+    items = []
+    valid_slots = []
+    for line_number, line in enumerate(lines, first_line):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            content = record.get("content")
+            if not content or not isinstance(content, str):
+                raise ValueError("Content is required")
+            items.append({"title": record.get("title") or "", "content": content})
+            valid_slots.append(len(slots))
+            slots.append({"line": line_number, "id": record.get("id")})
+        except Exception as e:
+            slots.append({"line": line_number, "error": str(e)})
+
+    for slot_index, result in zip(valid_slots, detector.detect_batch(items)):
+        output = slots[slot_index]
+        output["is_fake"] = result.is_fake
+        output["confidence_score"] = result.confidence_score
+        output["explanation"] = result.explanation
+        if include_features:
+            output["features"] = result.features
+
+    serialized = "".join(json.dumps(output) + "\n" for output in slots)
+    return serialized, len(slots), len(slots) - len(items)
+
+
+def shard_rng(seed: int, shard: int) -> random.Random:
+    """
+    Derive the independent random stream for one corpus shard.
+
+    String seeds are hashed with SHA-512 by random.Random, so the stream depends only
+    on (seed, shard) and is identical across processes, platforms and PYTHONHASHSEED.
+
+    Args:
+        seed: Root seed of the corpus
+        shard: Shard index
+
+    Returns:
+        Seeded random.Random for the shard
+    """
+    return random.Random(f"{seed}/{shard}")
+
+
+def _generate_shard(seed: int, shard: int, count: int, category: str,
+                    reference_date: datetime) -> List[NewsArticle]:
+    """
+    Generate one shard of a synthetic corpus inside a worker process.
+
+    Args:
+        seed: Root seed of the corpus
+        shard: Shard index
+        count: Articles to generate
+        category: Article category passed to generate_fake_news
+        reference_date: Date publish dates are counted back from
+
+    Returns:
+        List of generated articles
+    """
+    global _worker_generator
+    if _worker_generator is None:
+        _worker_generator = FakeNewsGenerator()
+    generator = _worker_generator
+    generator.rng = shard_rng(seed, shard)
+    generator.reference_date = reference_date
+    return [generator.generate_fake_news(category) for _ in range(count)]
+
+
+def iter_articles(n: int, seed: int = 0, workers: Optional[int] = 1, category: str = "random",
+                  reference_date: datetime = CORPUS_REFERENCE_DATE) -> Iterator[NewsArticle]:
+    """
+    Generate a labelled synthetic corpus, optionally in parallel.
+
+    The corpus is split into shards of GENERATION_SHARD_SIZE articles, each drawn from
+    its own random stream derived from the root seed. Output is therefore bit-for-bit
+    identical for a given (n, seed, category, reference_date) whatever the worker count.
+
+    Args:
+        n: Number of articles to generate
+        seed: Root seed of the corpus
+        workers: Worker processes; 1 generates in-process, None uses the CPU count
+        category: Article category passed to generate_fake_news
+        reference_date: Date publish dates are counted back from
+
+    Yields:
+        NewsArticle: Generated articles, in corpus order
+    """
+    shards = [
+        (shard, min(GENERATION_SHARD_SIZE, n - start))
+        for shard, start in enumerate(range(0, n, GENERATION_SHARD_SIZE))
+    ]
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        for shard, count in shards:
+            yield from _generate_shard(seed, shard, count, category, reference_date)
+        return
+
+    max_in_flight = workers * IN_FLIGHT_PER_WORKER
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        queue: Deque[Future] = deque()
+        for shard, count in shards:
+            if len(queue) >= max_in_flight:
+                yield from queue.popleft().result()
+            queue.append(executor.submit(_generate_shard, seed, shard, count, category, reference_date))
+        while queue:
+            yield from queue.popleft().result()
+
+
+def article_to_record(article: NewsArticle) -> Dict:
+    """Convert an article to a JSON-serializable corpus record."""
+    return {
+        "title": article.title,
+        "content": article.content,
+        "author": article.author,
+        "source": article.source,
+        "publish_date": article.publish_date.strftime("%Y-%m-%d"),
+        "category": article.category,
+        "is_fake": article.is_fake
+    }
+
+
+def iter_line_chunks(lines: Iterable[str], chunk_size: int) -> Iterator[Tuple[int, List[str]]]:
+    """Yield (first line number, lines) chunks from a line iterator."""
+    numbered = enumerate(lines, 1)
+    while True:
+        chunk = list(islice(numbered, chunk_size))
+        if not chunk:
+            return
+        yield chunk[0][0], [line for _, line in chunk]
+
+
+class _Progress:
+    """Throttled progress and throughput readout."""
+
+    def __init__(self, stream: Optional[TextIO], interval: float) -> None:
+        self.stream = stream
+        self.interval = interval
+        self.started = time.perf_counter()
+        self.last_report = self.started
+        self.records = 0
+        self.errors = 0
+
+    def update(self, records: int, errors: int) -> None:
+        self.records += records
+        self.errors += errors
+        now = time.perf_counter()
+        if self.stream is not None and now - self.last_report >= self.interval:
+            self.last_report = now
+            self.report(now)
+
+    def report(self, now: Optional[float] = None) -> None:
+        elapsed = (now or time.perf_counter()) - self.started
+        rate = self.records / elapsed if elapsed > 0 else 0.0
+        if self.stream is not None:
+            print(f"scored {self.records:,} records ({self.errors:,} errors) "
+                  f"in {elapsed:.1f}s - {rate:,.0f} records/s", file=self.stream, flush=True)
+
+    def summary(self) -> Dict[str, float]:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "records": self.records,
+            "errors": self.errors,
+            "elapsed_seconds": elapsed,
+            "records_per_second": self.records / elapsed if elapsed > 0 else 0.0
+        }
+
+
+def score_stream(lines: Iterable[str], out: TextIO, workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, ordered: bool = False,
+                 include_features: bool = False, progress: Optional[TextIO] = None,
+                 progress_interval: float = 5.0) -> Dict[str, float]:
+    """
+    Score a stream of JSONL articles across a process pool.
+
+    Input is read lazily in chunks and at most workers * IN_FLIGHT_PER_WORKER chunks
+    are outstanding at any time, so memory stays constant however long the stream is.
+
+    Args:
+        lines: JSONL lines, each an object with "content" and optional "title" and "id"
+        out: Text stream receiving one JSONL result per non-blank input line
+        workers: Number of worker processes (defaults to the CPU count)
+        chunk_size: Input lines per worker task
+        ordered: Write results in input order instead of completion order
+        include_features: Include the feature dict in every output record
+        progress: Stream for periodic progress lines (None disables them)
+        progress_interval: Seconds between progress lines
+
+    Returns:
+        Dict with record, error, elapsed time and throughput totals
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * IN_FLIGHT_PER_WORKER
+    tracker = _Progress(progress, progress_interval)
+
+    def drain(future: Future) -> None:
+        serialized, records, errors = future.result()
+        out.write(serialized)
+        tracker.update(records, errors)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        if ordered:
+            queue: Deque[Future] = deque()
+            for first_line, chunk in iter_line_chunks(lines, chunk_size):
+                if len(queue) >= max_in_flight:
+                    drain(queue.popleft())
+                queue.append(executor.submit(_score_chunk, first_line, chunk, include_features))
+            while queue:
+                drain(queue.popleft())
+        else:
+            pending: Set[Future] = set()
+            for first_line, chunk in iter_line_chunks(lines, chunk_size):
+                if len(pending) >= max_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        drain(future)
+                pending.add(executor.submit(_score_chunk, first_line, chunk, include_features))
+            for future in pending:
+                drain(future)
+
+    out.flush()
+    tracker.report()
+    return tracker.summary()
+
+
+def _cmd_score(args: argparse.Namespace) -> int:
+    """Run the score subcommand."""
+    source = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        summary = score_stream(
+            source,
+            sink,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            ordered=args.ordered,
+            include_features=args.features,
+            progress=None if args.quiet else sys.stderr,
+            progress_interval=args.progress_interval
+        )
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    return 1 if summary["errors"] and args.strict else 0
+
+
+def _cmd_generate(args: argparse.Namespace) -> int:
+    """Run the generate subcommand."""
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        for index, article in enumerate(iter_articles(args.count, args.seed, args.workers, args.category)):
+            record = article_to_record(article)
+            record["id"] = index
+            sink.write(json.dumps(record) + "\n")
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser."""
+    parser = argparse.ArgumentParser(description="Corpus-level batch jobs for the fake news detector")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    score = subparsers.add_parser("score", help="Score a JSONL stream of articles in parallel")
+    score.add_argument("input", help="JSONL file of articles, or - for stdin")
+    score.add_argument("-o", "--output", default="-", help="JSONL output file, or - for stdout (default)")
+    score.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    score.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Lines per worker task")
+    score.add_argument("--ordered", action="store_true", help="Preserve input order in the output")
+    score.add_argument("--features", action="store_true", help="Include feature dicts in the output")
+    score.add_argument("--progress-interval", type=float, default=5.0, help="Seconds between progress lines")
+    score.add_argument("-q", "--quiet", action="store_true", help="Disable progress output")
+    score.add_argument("--strict", action="store_true", help="Exit non-zero if any record failed")
+    score.set_defaults(handler=_cmd_score)
+
+    generate = subparsers.add_parser("generate", help="Generate a reproducible labelled synthetic corpus")
+    generate.add_argument("count", type=int, help="Number of articles to generate")
+    generate.add_argument("--seed", type=int, default=0, help="Root seed of the corpus")
+    generate.add_argument("--category", default="random", help="Article category (default: random)")
+    generate.add_argument("-o", "--output", default="-", help="JSONL output file, or - for stdout (default)")
+    generate.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    generate.set_defaults(handler=_cmd_generate)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
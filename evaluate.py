@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Offline evaluation harness for the fake news detector.
+Scores a labelled corpus in parallel and reports the confusion matrix, precision/recall, ROC/PR curves and the best threshold as JSON.
+
+Usage:
+    python evaluate.py real.jsonl --generate 100000 -o report.json
+    python evaluate.py labelled.jsonl --model model.json --workers 16
+    python evaluate.py real.jsonl --generate 1000000 --objective youden
+
+Input records are JSONL objects with "content", an optional "title" and a label in
+"is_fake" (or "label": 1 for fake, 0 for real), as read by trainer.py. --generate N
+adds N synthetic fake articles, drawn shard by shard exactly as `corpus.py generate N
+--seed S` would produce them.
+
+Workers return only a score and a label per article, so the parent holds two small
+arrays however large the corpus is. All threshold-dependent metrics come from a single
+descending sort of the score array: cumulative sums over the sorted labels give the
+true and false positive counts at every distinct threshold at once.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Set, TextIO, Tuple
+
+import numpy as np
+
+from corpus import CORPUS_REFERENCE_DATE, GENERATION_SHARD_SIZE, iter_line_chunks, shard_rng
+from main import FakeNewsDetector, FakeNewsGenerator
+from trainer import parse_label
+
+# Input lines handed to a worker at a time
+DEFAULT_CHUNK_SIZE = 1024
+
+# Chunks allowed in flight per worker; bounds memory independently of input size
+IN_FLIGHT_PER_WORKER = 2
+
+# Points kept per curve in the report
+DEFAULT_CURVE_POINTS = 201
+
+# Criteria the best threshold can maximize, and the report field holding each
+OBJECTIVES = {"f1": "f1", "youden": "youden_j", "accuracy": "accuracy"}
+
+# Detector and generator owned by each worker process, built once by _init_worker
+_worker_detector: Optional[FakeNewsDetector] = None
+_worker_generator: Optional[FakeNewsGenerator] = None
+
+Scored = Tuple[np.ndarray, np.ndarray, int]
+
+
+def _build_detector(lexicon_pack: Optional[str], phrase_matching: bool,
+                    model_path: Optional[str]) -> FakeNewsDetector:
+    """Build a detector configured like the one under evaluation."""
+    return FakeNewsDetector(phrase_matching=phrase_matching, lexicon_pack=lexicon_pack, model_path=model_path)
+
+
+def _init_worker(lexicon_pack: Optional[str], phrase_matching: bool, model_path: Optional[str]) -> None:
+    """Build the per-process detector and generator used by the scoring tasks."""
+    global _worker_detector, _worker_generator
+    _worker_detector = _build_detector(lexicon_pack, phrase_matching, model_path)
+    _worker_generator = FakeNewsGenerator()
+
+
+def _score_records(lines: List[str]) -> Scored:
+    """
+    Score a chunk of labelled JSONL records inside a worker process.
+
+    Returns:
+        Tuple of (float32 scores, bool labels, invalid records)
+    """
+    items = []
+    labels = []
+    errors = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            content = record.get("content")
+            if not content or not isinstance(content, str):
+                raise ValueError("Content is required")
+            labels.append(parse_label(record))
+            items.append({"title": record.get("title") or "", "content": content})
+        except (ValueError, TypeError, AttributeError):
+            errors += 1
+
+    results = _worker_detector.detect_batch(items, vectorized=True)
+    scores = np.fromiter((result.confidence_score for result in results), dtype=np.float32, count=len(results))
+    return scores, np.asarray(labels, dtype=bool), errors
+
+
+def _score_generated(seed: int, shard: int, count: int) -> Scored:
+    """
+    Generate and score one shard of synthetic fake articles inside a worker process.
+
+    Returns:
+        Tuple of (float32 scores, bool labels, invalid records)
+    """
+    generator = _worker_generator
+    generator.rng = shard_rng(seed, shard)
+    generator.reference_date = CORPUS_REFERENCE_DATE
+    batch = generator.generate_batch(count)
+    return _worker_detector.detect_articles(batch).confidence_scores, batch.is_fake, 0
+
+
+def _iter_tasks(paths: List[str], generate: int, seed: int, chunk_size: int) -> Iterator[Tuple]:
+    """Yield (function, *args) scoring tasks: input chunks first, then generated shards."""
+    for path in paths:
+        handle = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+        try:
+            for _, lines in iter_line_chunks(handle, chunk_size):
+                yield _score_records, lines
+        finally:
+            if handle is not sys.stdin:
+                handle.close()
+    for shard, start in enumerate(range(0, generate, GENERATION_SHARD_SIZE)):
+        yield _score_generated, seed, shard, min(GENERATION_SHARD_SIZE, generate - start)
+
+
+def score_corpus(paths: List[str], generate: int = 0, seed: int = 0, workers: int = 1,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, lexicon_pack: Optional[str] = None,
+                 phrase_matching: bool = False, model_path: Optional[str] = None,
+                 progress: Optional[TextIO] = None, progress_interval: float = 5.0) -> Scored:
+    """
+    Score a labelled corpus across a process pool.
+
+    Args:
+        paths: Labelled JSONL inputs (- for stdin)
+        generate: Synthetic fake articles added to the corpus
+        seed: Root seed of the synthetic articles
+        workers: Worker processes; 1 scores in-process
+        chunk_size: Input lines per worker task
+        lexicon_pack: Lexicon pack of the detector under evaluation
+        phrase_matching: Phrase matching setting of that detector
+        model_path: Learned weight file of that detector
+        progress: Stream for progress lines (None disables them)
+        progress_interval: Seconds between progress lines
+
+    Returns:
+        Tuple of (float32 scores, bool labels, invalid records), in no particular order
+    """
+    score_chunks: List[np.ndarray] = []
+    label_chunks: List[np.ndarray] = []
+    errors = 0
+    started = time.monotonic()
+    last_report = started
+
+    def collect(scored: Scored) -> None:
+        nonlocal errors, last_report
+        score_chunks.append(scored[0])
+        label_chunks.append(scored[1])
+        errors += scored[2]
+        now = time.monotonic()
+        if progress is not None and now - last_report >= progress_interval:
+            last_report = now
+            rows = sum(map(len, score_chunks))
+            print(f"scored {rows:,} articles  {rows / (now - started):,.0f} articles/s", file=progress)
+
+    tasks = _iter_tasks(paths, generate, seed, chunk_size)
+    if workers == 1:
+        _init_worker(lexicon_pack, phrase_matching, model_path)
+        for function, *args in tasks:
+            collect(function(*args))
+    else:
+        max_in_flight = workers * IN_FLIGHT_PER_WORKER
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(lexicon_pack, phrase_matching, model_path)) as executor:
+            pending: Set[Future] = set()
+            for function, *args in tasks:
+                if len(pending) >= max_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future.result())
+                pending.add(executor.submit(function, *args))
+            for future in pending:
+                collect(future.result())
+
+    scores = np.concatenate(score_chunks) if score_chunks else np.zeros(0, dtype=np.float32)
+    labels = np.concatenate(label_chunks) if label_chunks else np.zeros(0, dtype=bool)
+    return scores, labels, errors
+
+
+def threshold_sweep(scores: np.ndarray, labels: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Confusion counts at every distinct score, from one descending sort.
+
+    Row k of the result classifies as fake every article scoring at least scores[k];
+    "threshold" is the matching cut for the detector's score > threshold rule, halfway
+    to the next lower score.
+
+    Args:
+        scores: Scores of shape (N,)
+        labels: bool labels of shape (N,), True for fake
+
+    Returns:
+        Dict of equally long arrays: threshold, score, tp, fp, fn, tn (highest score first)
+    """
+    order = np.argsort(-scores, kind="stable")
+    sorted_scores = scores[order].astype(np.float64)
+    true_positives = np.cumsum(labels[order], dtype=np.int64)
+
+    # Last position of every run of equal scores
+    ends = np.append(np.flatnonzero(np.diff(sorted_scores)), len(sorted_scores) - 1)
+    cut_scores = sorted_scores[ends]
+    tp = true_positives[ends]
+    fp = ends + 1 - tp
+    positives = int(true_positives[-1])
+    negatives = len(scores) - positives
+
+    lower = np.append(cut_scores[1:], -np.inf)
+    thresholds = np.where(np.isfinite(lower), (cut_scores + lower) / 2, np.nextafter(cut_scores, -np.inf))
+    return {
+        "threshold": thresholds,
+        "score": cut_scores,
+        "tp": tp,
+        "fp": fp,
+        "fn": positives - tp,
+        "tn": negatives - fp
+    }
+
+
+def binary_metrics(tp: int, fp: int, fn: int, tn: int) -> Dict[str, float]:
+    """
+    Confusion matrix and the metrics derived from it.
+
+    Returns:
+        Dict with the four counts, precision, recall, f1, accuracy, false positive rate
+        and Youden's J
+    """
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    fpr = fp / (fp + tn) if fp + tn else 0.0
+    return {
+        "confusion_matrix": {"tp": tp, "fp": fp, "fn": fn, "tn": tn},
+        "precision": precision,
+        "recall": recall,
+        "f1": 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+        "accuracy": (tp + tn) / max(tp + fp + fn + tn, 1),
+        "false_positive_rate": fpr,
+        "youden_j": recall - fpr
+    }
+
+
+def _downsample(length: int, points: int) -> np.ndarray:
+    """Evenly spaced indices into a curve of the given length, keeping both ends."""
+    if length <= points:
+        return np.arange(length)
+    return np.unique(np.linspace(0, length - 1, points).round().astype(np.int64))
+
+
+def evaluate(scores: np.ndarray, labels: np.ndarray, threshold: float, objective: str = "f1",
+             curve_points: int = DEFAULT_CURVE_POINTS) -> Dict:
+    """
+    Build the evaluation report of a scored corpus.
+
+    Args:
+        scores: Scores of shape (N,)
+        labels: bool labels of shape (N,), True for fake
+        threshold: Threshold the detector is configured with
+        objective: Metric maximized by the best threshold (one of OBJECTIVES)
+        curve_points: Points kept per curve
+
+    Returns:
+        JSON-serializable report
+
+    Raises:
+        ValueError: If the corpus is empty or contains only one class
+    """
+    positives = int(labels.sum())
+    if positives in (0, len(labels)):
+        raise ValueError("Evaluation corpus must contain both fake and real articles")
+
+    sweep = threshold_sweep(scores, labels)
+    tp, fp = sweep["tp"], sweep["fp"]
+    negatives = len(labels) - positives
+
+    # Curves start at the "nothing is fake" corner
+    tpr = np.concatenate(([0.0], tp / positives))
+    fpr = np.concatenate(([0.0], fp / negatives))
+    precision = np.concatenate(([1.0], tp / (tp + fp)))
+    roc_auc = float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2))
+    average_precision = float(np.sum(np.diff(tpr) * precision[1:]))
+
+    if objective == "f1":
+        values = 2 * tp / (2 * tp + fp + sweep["fn"])
+    elif objective == "youden":
+        values = tp / positives - fp / negatives
+    elif objective == "accuracy":
+        values = (tp + sweep["tn"]) / len(labels)
+    else:
+        raise ValueError(f"Unknown objective: {objective}")
+    best = int(np.argmax(values))
+
+    predicted = scores > threshold
+    configured = binary_metrics(
+        int(np.sum(predicted & labels)), int(np.sum(predicted & ~labels)),
+        int(np.sum(~predicted & labels)), int(np.sum(~predicted & ~labels))
+    )
+    chosen = binary_metrics(int(tp[best]), int(fp[best]), int(sweep["fn"][best]), int(sweep["tn"][best]))
+
+    roc_index = _downsample(len(fpr), curve_points)
+    curve_thresholds = np.concatenate(([1.0], sweep["threshold"]))[roc_index]
+    return {
+        "articles": len(labels),
+        "fake": positives,
+        "real": negatives,
+        "roc_auc": roc_auc,
+        "average_precision": average_precision,
+        "configured_threshold": {"threshold": threshold, **configured},
+        "best_threshold": {"objective": objective, "threshold": float(sweep["threshold"][best]), **chosen},
+        "roc_curve": {
+            "threshold": curve_thresholds.tolist(),
+            "false_positive_rate": fpr[roc_index].tolist(),
+            "true_positive_rate": tpr[roc_index].tolist()
+        },
+        "pr_curve": {
+            "threshold": curve_thresholds.tolist(),
+            "precision": precision[roc_index].tolist(),
+            "recall": tpr[roc_index].tolist()
+        }
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser."""
+    parser = argparse.ArgumentParser(description="Evaluate the detector on a labelled corpus")
+    parser.add_argument("inputs", nargs="*", help="Labelled JSONL files, or - for stdin")
+    parser.add_argument("--generate", type=int, default=0, help="Synthetic fake articles added to the corpus")
+    parser.add_argument("--seed", type=int, default=0, help="Root seed of the synthetic articles")
+    parser.add_argument("-o", "--output", default="-", help="JSON report file, or - for stdout (default)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Lines per worker task")
+    parser.add_argument("--objective", choices=tuple(OBJECTIVES), default="f1", help="Metric the best threshold maximizes")
+    parser.add_argument("--curve-points", type=int, default=DEFAULT_CURVE_POINTS, help="Points kept per curve")
+    parser.add_argument("--model", default=None, help="Learned weight file of the detector (see trainer.py)")
+    parser.add_argument("--lexicon-pack", default=None, help="Lexicon pack of the detector")
+    parser.add_argument("--phrase-matching", action="store_true", help="Evaluate a phrase-matching detector")
+    parser.add_argument("--progress-interval", type=float, default=5.0, help="Seconds between progress lines")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Disable progress output")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    args = build_parser().parse_args(argv)
+    if args.inputs.count("-") > 1:
+        print("stdin can only be read once", file=sys.stderr)
+        return 2
+    if not args.inputs and not args.generate:
+        print("nothing to evaluate: pass labelled inputs and/or --generate N", file=sys.stderr)
+        return 2
+
+    detector = _build_detector(args.lexicon_pack, args.phrase_matching, args.model)
+    started = time.monotonic()
+    scores, labels, errors = score_corpus(
+        args.inputs,
+        generate=args.generate,
+        seed=args.seed,
+        workers=args.workers or os.cpu_count() or 1,
+        chunk_size=args.chunk_size,
+        lexicon_pack=args.lexicon_pack,
+        phrase_matching=args.phrase_matching,
+        model_path=args.model,
+        progress=None if args.quiet else sys.stderr,
+        progress_interval=args.progress_interval
+    )
+    scoring_seconds = time.monotonic() - started
+
+    try:
+        report = evaluate(scores, labels, detector.threshold, args.objective, args.curve_points)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    report["invalid_records"] = errors
+    report["detector"] = {
+        "fingerprint": detector.fingerprint,
+        "model": args.model,
+        "lexicon_pack": args.lexicon_pack,
+        "phrase_matching": args.phrase_matching
+    }
+    report["seconds"] = time.monotonic() - started
+    report["articles_per_second"] = len(labels) / scoring_seconds if scoring_seconds > 0 else 0.0
+    report["created"] = datetime.now(timezone.utc).isoformat()
+
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        json.dump(report, sink, indent=2)
+        sink.write("\n")
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+
+    if not args.quiet:
+        best = report["best_threshold"]
+        print(f"evaluated {report['articles']:,} articles in {report['seconds']:.1f}s  "
+              f"ROC AUC {report['roc_auc']:.4f}  best {args.objective} {best[OBJECTIVES[args.objective]]:.4f} "
+              f"at threshold {best['threshold']:.4f}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
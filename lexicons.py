@@ -0,0 +1,269 @@
+"""
+Externally loaded lexicon packs for the fake news detector.
+Loads lexicons from text files, compiles them into a memory-mapped binary index and watches packs for changes.
+
+A pack is a directory holding one UTF-8 text file per lexicon (fake_indicators.txt,
+credibility_indicators.txt, emotional_words.txt, urgency_words.txt, exaggeration_words.txt)
+with one entry per line; blank lines and lines starting with # are ignored.
+
+The compiled index is an open-addressing hash table written next to the pack as
+lexicons.idx. It is opened with mmap, so every worker process maps the same physical
+pages instead of building its own dictionary, and it is rebuilt whenever the pack's
+content digest changes.
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import zlib
+from typing import Callable, Dict, List, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Lexicons in a pack, in detector order
+LEXICON_NAMES = (
+    "fake_indicators",
+    "credibility_indicators",
+    "emotional_words",
+    "urgency_words",
+    "exaggeration_words"
+)
+
+# Pack shipped with the repository, identical to the detector's built-in lexicons
+DEFAULT_PACK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lexicons")
+
+# File name of the compiled index inside a pack directory
+INDEX_FILENAME = "lexicons.idx"
+
+# Index layout: header, slot table, key blob
+_MAGIC = b"FNLX"
+_VERSION = 1
+_HEADER = struct.Struct("<4sII I32s")  # magic, version, slot count, entry count, pack digest
+_SLOT = struct.Struct("<IHH")  # key offset in blob, key length, value mask
+_EMPTY = 0xFFFFFFFF
+
+
+def load_pack(directory: str) -> Dict[str, List[str]]:
+    """
+    Read every lexicon file of a pack.
+
+    Args:
+        directory: Pack directory
+
+    Returns:
+        Dict of lexicon name -> entries (missing files yield empty lexicons)
+    """
+    lexicons = {}
+    for name in LEXICON_NAMES:
+        path = os.path.join(directory, f"{name}.txt")
+        entries: List[str] = []
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as handle:
+                for line in handle:
+                    entry = line.strip()
+                    if entry and not entry.startswith("#"):
+                        entries.append(entry)
+        lexicons[name] = entries
+    return lexicons
+
+
+def pack_digest(lexicons: Dict[str, Sequence[str]]) -> bytes:
+    """
+    Content digest of a set of lexicons, independent of entry order and duplicates.
+
+    Returns:
+        32-byte SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    for name in LEXICON_NAMES:
+        digest.update(name.encode("utf-8", "surrogatepass") + b"\0")
+        for entry in sorted(set(lexicons.get(name, ()))):
+            digest.update(entry.encode("utf-8", "surrogatepass") + b"\n")
+    return digest.digest()
+
+
+def pack_signature(directory: str) -> Tuple[Tuple[str, float, int], ...]:
+    """Cheap change signature of a pack: (file, mtime, size) of every lexicon file."""
+    signature = []
+    for name in LEXICON_NAMES:
+        path = os.path.join(directory, f"{name}.txt")
+        try:
+            stat = os.stat(path)
+            signature.append((name, stat.st_mtime, stat.st_size))
+        except FileNotFoundError:
+            signature.append((name, 0.0, -1))
+    return tuple(signature)
+
+
+class LexiconIndex:
+    """
+    Read-only, memory-mapped key -> mask table.
+
+    Lookups hash the UTF-8 key with CRC-32 and probe linearly; the table is kept at
+    most half full. Supports the dict-style get(key, default) used by the detector.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Map an index file.
+
+        Args:
+            path: Index file written by LexiconIndex.write
+        """
+        with open(path, "rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, slot_count, entry_count, digest = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"Invalid lexicon index: {path}")
+
+        self.path = path
+        self.digest = digest
+        self.entry_count = entry_count
+        self._slot_mask = slot_count - 1
+        self._slots_at = _HEADER.size
+        self._blob_at = _HEADER.size + slot_count * _SLOT.size
+
+    @staticmethod
+    def write(path: str, lookup: Dict[str, int], digest: bytes) -> None:
+        """
+        Write an index file atomically.
+
+        The table is written to a temporary file and renamed into place, so processes
+        that already mapped the previous index keep reading a consistent file.
+
+        Args:
+            path: Destination path
+            lookup: Key -> mask (masks must fit in 16 bits)
+            digest: Pack digest stored in the header
+        """
+        slot_count = 8
+        while slot_count < len(lookup) * 2:
+            slot_count *= 2
+
+        slots = [(_EMPTY, 0, 0)] * slot_count
+        blob = bytearray()
+        for key, value in lookup.items():
+            data = key.encode("utf-8", "surrogatepass")
+            if len(data) > 0xFFFF or not 0 <= value <= 0xFFFF:
+                raise ValueError(f"Lexicon entry out of range: {key[:40]!r}")
+            slot = zlib.crc32(data) & (slot_count - 1)
+            while slots[slot][0] != _EMPTY:
+                slot = (slot + 1) & (slot_count - 1)
+            slots[slot] = (len(blob), len(data), value)
+            blob += data
+
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".lexicons-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(_HEADER.pack(_MAGIC, _VERSION, slot_count, len(lookup), digest))
+                for slot in slots:
+                    handle.write(_SLOT.pack(*slot))
+                handle.write(bytes(blob))
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def get(self, key: str, default: int = 0) -> int:
+        """Look up the mask of a key."""
+        data = key.encode("utf-8", "surrogatepass")
+        length = len(data)
+        index_map = self._map
+        slot = zlib.crc32(data) & self._slot_mask
+        while True:
+            offset, slot_length, value = _SLOT.unpack_from(index_map, self._slots_at + slot * _SLOT.size)
+            if offset == _EMPTY:
+                return default
+            if slot_length == length:
+                start = self._blob_at + offset
+                if index_map[start:start + length] == data:
+                    return value
+            slot = (slot + 1) & self._slot_mask
+
+    def __len__(self) -> int:
+        return self.entry_count
+
+
+def open_index(directory: str, lexicons: Dict[str, Sequence[str]],
+               build_lookup: Callable[[Dict[str, Sequence[str]]], Dict[str, int]]) -> LexiconIndex:
+    """
+    Open the compiled index of a pack, rebuilding it if it is missing or stale.
+
+    Args:
+        directory: Pack directory
+        lexicons: Pack contents as returned by load_pack
+        build_lookup: Builds the key -> mask table from the lexicons when a rebuild is needed
+
+    Returns:
+        LexiconIndex mapped from the pack's index file
+    """
+    path = os.path.join(directory, INDEX_FILENAME)
+    digest = pack_digest(lexicons)
+
+    if os.path.exists(path):
+        try:
+            index = LexiconIndex(path)
+            if index.digest == digest:
+                return index
+        except (ValueError, struct.error, OSError) as e:
+            logger.warning("Rebuilding unreadable lexicon index %s: %s", path, e)
+
+    LexiconIndex.write(path, build_lookup(lexicons), digest)
+    logger.info("Compiled lexicon index %s", path)
+    return LexiconIndex(path)
+
+
+class PackWatcher(threading.Thread):
+    """
+    Polls a pack directory and invokes a callback when any lexicon file changes.
+
+    Runs as a daemon thread; errors raised by the callback are logged and the previous
+    lexicons stay in place.
+    """
+
+    def __init__(self, directory: str, callback: Callable[[str], None], interval: float = 2.0) -> None:
+        super().__init__(name="lexicon-pack-watcher", daemon=True)
+        self.directory = directory
+        self.callback = callback
+        self.interval = interval
+        self._signature = pack_signature(directory)
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            signature = pack_signature(self.directory)
+            if signature == self._signature:
+                continue
+            self._signature = signature
+            try:
+                self.callback(self.directory)
+            except Exception as e:
+                logger.error("Error reloading lexicon pack %s: %s", self.directory, e)
+
+    def stop(self) -> None:
+        """Stop polling."""
+        self._stopped.set()
+
+
+def write_pack(directory: str, lexicons: Dict[str, Sequence[str]]) -> None:
+    """
+    Write lexicons out as a pack directory.
+
+    Args:
+        directory: Pack directory (created if missing)
+        lexicons: Lexicon name -> entries
+    """
+    os.makedirs(directory, exist_ok=True)
+    for name in LEXICON_NAMES:
+        with open(os.path.join(directory, f"{name}.txt"), "w", encoding="utf-8") as handle:
+            handle.write(f"# {name.replace('_', ' ')}, one entry per line\n")
+            for entry in lexicons.get(name, ()):
+                handle.write(entry + "\n")
+
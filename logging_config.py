@@ -0,0 +1,149 @@
+"""
+Logging setup for the fake news generator, detector and web app.
+Hands log records to a background thread through a queue, with per-event sampling and optional JSON output.
+
+Library modules only create loggers; nothing is configured until an entry point calls
+configure_logging(). Hot-path log calls pass their arguments lazily and tag themselves with
+an event name (extra={"event": ...}) so they can be sampled:
+
+    configure_logging(sample_rates={"detection_completed": 0.01})
+
+Environment overrides: FAKE_NEWS_LOG_LEVEL, FAKE_NEWS_LOG_JSON=1 and
+FAKE_NEWS_LOG_SAMPLE="detection_completed=0.01,article_generated=0.1".
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Optional, TextIO
+
+# Format used for plain-text output
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+# Listener of the active configuration, stopped on reconfiguration and at exit
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.Handler] = None
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a configured fraction of the records of each sampled event.
+
+    Records without an event name, or whose event has no configured rate, always pass.
+    Warnings and errors are never sampled.
+    """
+
+    def __init__(self, rates: Dict[str, float]) -> None:
+        super().__init__()
+        self.rates = dict(rates)
+        self._random = random.Random()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(getattr(record, "event", None))
+        if rate is None:
+            return True
+        return rate > 0 and (rate >= 1 or self._random.random() < rate)
+
+
+class JSONFormatter(logging.Formatter):
+    """Formats records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        event = getattr(record, "event", None)
+        if event is not None:
+            payload["event"] = event
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread.
+
+    The stock handler merges the message and arguments in the calling thread so records
+    can be pickled; this queue never leaves the process, so the record is enqueued as is.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _parse_sample_rates(spec: str) -> Dict[str, float]:
+    """Parse "event=rate,event=rate" into a dict."""
+    rates = {}
+    for item in spec.split(","):
+        if "=" in item:
+            event, rate = item.split("=", 1)
+            rates[event.strip()] = float(rate)
+    return rates
+
+
+def configure_logging(level: Optional[str] = None, json_output: Optional[bool] = None,
+                      sample_rates: Optional[Dict[str, float]] = None,
+                      stream: Optional[TextIO] = None) -> None:
+    """
+    Route all logging through a background thread.
+
+    Safe to call more than once; a previous configuration is replaced.
+
+    Args:
+        level: Root log level name (default: FAKE_NEWS_LOG_LEVEL or INFO)
+        json_output: Emit JSON lines instead of text (default: FAKE_NEWS_LOG_JSON)
+        sample_rates: Event name -> fraction of records kept (default: FAKE_NEWS_LOG_SAMPLE)
+        stream: Output stream (default: stderr)
+    """
+    global _listener, _queue_handler
+
+    if level is None:
+        level = os.environ.get("FAKE_NEWS_LOG_LEVEL", "INFO")
+    if json_output is None:
+        json_output = os.environ.get("FAKE_NEWS_LOG_JSON", "0").lower() in ("1", "true", "yes", "on")
+    if sample_rates is None:
+        sample_rates = _parse_sample_rates(os.environ.get("FAKE_NEWS_LOG_SAMPLE", ""))
+
+    shutdown_logging()
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(JSONFormatter() if json_output else logging.Formatter(TEXT_FORMAT))
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _queue_handler = _DeferredQueueHandler(log_queue)
+    if sample_rates:
+        _queue_handler.addFilter(SamplingFilter(sample_rates))
+
+    root = logging.getLogger()
+    root.setLevel(level.upper() if isinstance(level, str) else level)
+    root.addHandler(_queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the background thread."""
+    global _listener, _queue_handler
+
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,250 @@
+"""
+Latency instrumentation for the fake news generator, detector and web app.
+Lightweight histograms and counters rendered in the Prometheus text exposition format.
+
+Metrics are on by default and can be switched off with FAKE_NEWS_METRICS=0 or
+set_enabled(False). When disabled, stage_clock() returns a shared no-op clock, so
+instrumented code pays a single attribute lookup per stage and never reads the timer.
+
+Each process keeps its own registry; under a multi-worker server every worker
+reports its own series.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+# Metric name of the per-stage latency histogram
+STAGE_METRIC = "fake_news_stage_seconds"
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+_enabled = os.environ.get("FAKE_NEWS_METRICS", "1").lower() not in ("0", "false", "no", "off")
+
+
+def enabled() -> bool:
+    """Whether metrics are being collected."""
+    return _enabled
+
+
+def set_enabled(value: bool) -> None:
+    """Switch metric collection on or off for this process."""
+    global _enabled
+    _enabled = bool(value)
+
+
+def _format_labels(labels: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    """Render a label set as {name="value",...}."""
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    body = ",".join(
+        '{}="{}"'.format(name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in pairs
+    )
+    return "{" + body + "}"
+
+
+class Histogram:
+    """Fixed-bucket histogram with a running sum and count."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += value
+            self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile by linear interpolation inside the matching bucket.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Estimated value (0.0 when the histogram is empty)
+        """
+        with self._lock:
+            counts = list(self.counts)
+            count = self.count
+        if not count:
+            return 0.0
+
+        rank = q * count
+        cumulative = 0
+        for index, bucket_count in enumerate(counts):
+            if cumulative + bucket_count >= rank and bucket_count:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.buckets[-1]
+
+
+class MetricsRegistry:
+    """Named collection of labelled histograms and counters."""
+
+    def __init__(self) -> None:
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._help: Dict[str, str] = {}
+        self._stages: Dict[Tuple[str, str], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, help_text: str) -> None:
+        """Set the HELP text of a metric."""
+        self._help[name] = help_text
+
+    def histogram(self, name: str, **labels: str) -> Histogram:
+        """Get or create the histogram for a name and label set."""
+        key = tuple(sorted(labels.items()))
+        series = self._histograms.get(name)
+        histogram = series.get(key) if series is not None else None
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, {}).setdefault(key, Histogram())
+        return histogram
+
+    def stage_histogram(self, component: str, stage: str) -> Histogram:
+        """Get the STAGE_METRIC histogram of a stage through a flat lookup table."""
+        histogram = self._stages.get((component, stage))
+        if histogram is None:
+            histogram = self._stages[(component, stage)] = self.histogram(
+                STAGE_METRIC, component=component, stage=stage
+            )
+        return histogram
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Record one observation in a histogram."""
+        self.histogram(name, **labels).observe(value)
+
+    def inc(self, name: str, amount: float = 1.0, **labels: str) -> None:
+        """Increment a counter."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def set_gauge(self, name: str, value: float, **labels: str) -> None:
+        """Set a gauge to an absolute value."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = value
+
+    def reset(self) -> None:
+        """Drop every recorded series."""
+        with self._lock:
+            self._histograms.clear()
+            self._stages.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format (version 0.0.4).
+
+        Returns:
+            Exposition text
+        """
+        lines: List[str] = []
+
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            gauges = {name: dict(series) for name, series in self._gauges.items()}
+            histograms = {name: dict(series) for name, series in self._histograms.items()}
+
+        for kind, metrics in (("counter", counters), ("gauge", gauges)):
+            for name in sorted(metrics):
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in sorted(metrics[name].items()):
+                    lines.append(f"{name}{_format_labels(labels)} {value:g}")
+
+        for name in sorted(histograms):
+            if name in self._help:
+                lines.append(f"# HELP {name} {self._help[name]}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, histogram in sorted(histograms[name].items()):
+                with histogram._lock:
+                    counts = list(histogram.counts)
+                    total = histogram.total
+                    count = histogram.count
+                cumulative = 0
+                for bound, bucket_count in zip(histogram.buckets, counts):
+                    cumulative += bucket_count
+                    lines.append(f"{name}_bucket{_format_labels(labels, ('le', f'{bound:g}'))} {cumulative}")
+                lines.append(f"{name}_bucket{_format_labels(labels, ('le', '+Inf'))} {count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {total:.9g}")
+                lines.append(f"{name}_count{_format_labels(labels)} {count}")
+
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry used by main.py and app.py
+REGISTRY = MetricsRegistry()
+REGISTRY.describe(STAGE_METRIC, "Latency of generator and detector stages in seconds")
+
+
+class StageClock:
+    """Records the time between consecutive laps as per-stage latencies."""
+
+    __slots__ = ("component", "registry", "last")
+
+    def __init__(self, component: str, registry: MetricsRegistry) -> None:
+        self.component = component
+        self.registry = registry
+        self.last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        """Record the time since the previous lap under `stage`."""
+        now = time.perf_counter()
+        self.registry.stage_histogram(self.component, stage).observe(now - self.last)
+        self.last = now
+
+
+class _NullClock:
+    """Stand-in clock used while metrics are disabled."""
+
+    __slots__ = ()
+
+    def lap(self, stage: str) -> None:
+        pass
+
+
+NULL_CLOCK = _NullClock()
+
+
+def stage_clock(component: str, registry: Optional[MetricsRegistry] = None) -> "StageClock":
+    """
+    Start timing the stages of one call.
+
+    Args:
+        component: Component label (e.g. "detector")
+        registry: Registry to record into (defaults to REGISTRY)
+
+    Returns:
+        A StageClock, or the no-op NULL_CLOCK when metrics are disabled
+    """
+    if not _enabled:
+        return NULL_CLOCK
+    return StageClock(component, registry or REGISTRY)
@@ -0,0 +1,241 @@
+"""
+Near-duplicate index for the fake news detector.
+A bounded, thread-safe MinHash LSH index that finds already-scored articles similar to a new one.
+
+Articles are reduced to a MinHash signature of their lowercased word shingles, computed
+with one-permutation hashing: the shingle hashes are split into SIGNATURE_BINS bins by
+their top bits and the minimum of every bin is kept (empty bins borrow the minimum of
+the next non-empty one). The fraction of bins two signatures agree on estimates the
+Jaccard similarity of their shingle sets, so near-copies (the same wire story under
+another headline or byline) score close to 1 while unrelated articles score low.
+
+Signatures are split into bands of ROWS_PER_BAND bins, and a lookup only compares
+against entries that agree on a whole band, instead of scanning the index. Entries are
+evicted least recently used first once max_size is reached.
+
+Shingles are hashed with the built-in hash, which is randomized per interpreter;
+signatures are only meaningful within the process that computed them.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+
+# Default number of indexed articles
+DEFAULT_MAX_SIZE = 10000
+
+# Default estimated Jaccard similarity at which an article counts as a near duplicate
+DEFAULT_THRESHOLD = 0.75
+
+# Articles with fewer shingles are neither looked up nor indexed; a single edited
+# sentence changes too large a share of a short text
+DEFAULT_MIN_SHINGLES = 32
+
+# MinHash bins per signature, and bins per LSH band (16 bands of 4 find pairs above a
+# similarity of 0.75 with a probability over 99%)
+SIGNATURE_BINS = 64
+ROWS_PER_BAND = 4
+
+_HASH_MASK = (1 << 64) - 1
+_BIN_SHIFT = 64 - (SIGNATURE_BINS.bit_length() - 1)
+
+
+def minhash(text: str) -> Tuple[Tuple[int, ...], int]:
+    """
+    Compute the MinHash signature of a text's word trigrams.
+
+    Args:
+        text: Text to sign
+
+    Returns:
+        Tuple of (signature of SIGNATURE_BINS values, number of shingles); the
+        signature is empty when the text has no shingles
+    """
+    words = text.lower().split()
+    shingles = zip(words, words[1:], words[2:])
+    hashes = sorted(map(_HASH_MASK.__and__, map(hash, shingles)), reverse=True)
+    if not hashes:
+        return (), 0
+
+    # Hashes arrive in descending order, so the last one written to a bin is its minimum
+    slots: List[Optional[int]] = [None] * SIGNATURE_BINS
+    for value in hashes:
+        slots[value >> _BIN_SHIFT] = value
+
+    # Densify: an empty bin takes the value of the next non-empty bin, wrapping around
+    following = next(value for value in slots if value is not None)
+    for index in range(SIGNATURE_BINS - 1, -1, -1):
+        if slots[index] is None:
+            slots[index] = following
+        else:
+            following = slots[index]
+    return tuple(slots), len(hashes)
+
+
+def similarity(first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(map(int.__eq__, first, second)) / SIGNATURE_BINS
+
+
+class NearDuplicate:
+    """A lookup hit: the stored result and a pointer to the article it was computed for."""
+
+    __slots__ = ("document_id", "similarity", "result")
+
+    def __init__(self, document_id: str, similarity: float, result: Any) -> None:
+        self.document_id = document_id
+        self.similarity = similarity
+        self.result = result
+
+    def pointer(self) -> Dict[str, Any]:
+        """JSON-serializable reference to the matched article."""
+        return {"id": self.document_id, "similarity": self.similarity}
+
+
+class NearDuplicateIndex:
+    """
+    Bounded LRU index of MinHash signatures with hit/miss/eviction counters.
+    All operations are guarded by a lock and safe to call from multiple threads.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE, threshold: float = DEFAULT_THRESHOLD,
+                 min_shingles: int = DEFAULT_MIN_SHINGLES) -> None:
+        """
+        Initialize the index.
+
+        Args:
+            max_size: Maximum number of articles kept before the least recently used is evicted
+            threshold: Estimated Jaccard similarity (0 to 1) an article needs to match
+            min_shingles: Word trigrams an article needs to be looked up or indexed
+        """
+        if max_size < 1:
+            raise ValueError(f"Invalid index size: {max_size}")
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError(f"Invalid near-duplicate threshold: {threshold}")
+
+        self.max_size = max_size
+        self.threshold = threshold
+        self.min_shingles = min_shingles
+
+        # (fingerprint, document id) -> (signature, result), in LRU order
+        self._entries: "OrderedDict[Tuple[Hashable, str], Tuple[Tuple[int, ...], Any]]" = OrderedDict()
+        # (fingerprint, band, band values) -> keys of the entries in that bucket
+        self._buckets: Dict[Tuple[Hashable, int, Tuple[int, ...]], Set[Tuple[Hashable, str]]] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.skipped = 0
+
+    def signature(self, text: str) -> Optional[Tuple[int, ...]]:
+        """
+        Sign a text for find() and add().
+
+        Returns:
+            The MinHash signature of the text, or None if it is too short to index
+        """
+        signature, shingles = minhash(text)
+        if shingles < self.min_shingles:
+            with self._lock:
+                self.skipped += 1
+            return None
+        return signature
+
+    @staticmethod
+    def _bucket_keys(signature: Tuple[int, ...], fingerprint: Hashable) -> List[Tuple[Hashable, int, Tuple[int, ...]]]:
+        return [
+            (fingerprint, start, signature[start:start + ROWS_PER_BAND])
+            for start in range(0, SIGNATURE_BINS, ROWS_PER_BAND)
+        ]
+
+    def find(self, signature: Tuple[int, ...], fingerprint: Hashable = "") -> Optional[NearDuplicate]:
+        """
+        Look up the most similar indexed article and mark it as recently used.
+
+        Args:
+            signature: Signature from signature()
+            fingerprint: Detector configuration the result must have been computed under
+
+        Returns:
+            The most similar article at or above the threshold, or None on a miss
+        """
+        with self._lock:
+            candidates: Set[Tuple[Hashable, str]] = set()
+            for bucket_key in self._bucket_keys(signature, fingerprint):
+                bucket = self._buckets.get(bucket_key)
+                if bucket:
+                    candidates.update(bucket)
+
+            best = None
+            best_similarity = self.threshold
+            for key in candidates:
+                score = similarity(signature, self._entries[key][0])
+                if score >= best_similarity:
+                    best, best_similarity = key, score
+
+            if best is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best)
+            self.hits += 1
+            return NearDuplicate(best[1], best_similarity, self._entries[best][1])
+
+    def add(self, signature: Tuple[int, ...], document_id: str, result: Any, fingerprint: Hashable = "") -> None:
+        """
+        Index a scored article, evicting the least recently used ones if the index is full.
+
+        Args:
+            signature: Signature from signature()
+            document_id: Identifier returned in the pointer of later matches
+            result: Stored result returned for later matches
+            fingerprint: Detector configuration the result was computed under
+        """
+        key = (fingerprint, document_id)
+        with self._lock:
+            if key in self._entries:
+                self._unlink(key)
+            self._entries[key] = (signature, result)
+            for bucket_key in self._bucket_keys(signature, fingerprint):
+                self._buckets.setdefault(bucket_key, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._unlink(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _unlink(self, key: Tuple[Hashable, str]) -> None:
+        """Remove an entry and its bucket memberships (caller holds the lock)."""
+        signature, _ = self._entries.pop(key)
+        for bucket_key in self._bucket_keys(signature, key[0]):
+            bucket = self._buckets[bucket_key]
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[bucket_key]
+
+    def clear(self) -> None:
+        """Drop every entry. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Snapshot of the index counters.
+
+        Returns:
+            Dict with size, capacity, threshold, hit/miss/eviction/skip counts and hit ratio
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "threshold": self.threshold,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "skipped": self.skipped,
+                "hit_ratio": self.hits / lookups if lookups else 0.0
+            }
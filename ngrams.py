@@ -0,0 +1,259 @@
+"""
+Hashed n-gram feature channel for the fake news detector.
+Hashes word unigrams and bigrams into a fixed-size signed sparse vector stored as CSR arrays.
+
+Every unigram and bigram of a document's lower-cased words is hashed into one of
+2**bits columns, with a hash-derived sign so collisions cancel out on average instead
+of accumulating. A batch of documents is a CSR matrix (indptr, indices, data) whose
+values are signed n-gram counts divided by the document's word count, so a learned
+weight vector scores a whole batch with one gather and one bincount. Cost grows with
+text length only; the vocabulary is never materialized.
+
+Requires NumPy. Weights are trained by trainer.py --ngram-bits.
+"""
+
+import hashlib
+from itertools import chain
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from phrase_matcher import WORD_RE
+
+# Default number of hash bits (2**18 columns)
+DEFAULT_HASH_BITS = 18
+
+# Multiplier mixing the two word hashes of a bigram
+_BIGRAM_MULTIPLIER = np.uint64(0x9E3779B1)
+_MASK32 = np.uint64(0xFFFFFFFF)
+
+# Odd multiplier of the polynomial word hash, and its cached powers
+_WORD_MULTIPLIER = np.uint64(0x100000001B3)
+_POWERS = np.ones(1, dtype=np.uint64)
+
+
+def _word_hashes(words: Sequence[str]) -> np.ndarray:
+    """
+    Polynomial hash of every word, computed over the words' code points in bulk.
+
+    Returns:
+        uint64 array of 32-bit word hashes
+    """
+    if not words:
+        return np.zeros(0, dtype=np.uint64)
+    lengths = np.fromiter(map(len, words), dtype=np.int64, count=len(words))
+    codes = np.frombuffer("".join(words).encode("utf-32-le", "surrogatepass"), dtype=np.uint32).astype(np.uint64)
+    starts = np.zeros(len(words), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=starts[1:])
+    positions = np.arange(len(codes), dtype=np.int64) - np.repeat(starts, lengths)
+    # uint64 arithmetic wraps, giving the hash modulo 2**64
+    hashes = np.add.reduceat((codes + np.uint64(1)) * _powers(int(lengths.max()))[positions], starts)
+    return (hashes ^ (hashes >> np.uint64(32))) & _MASK32
+
+
+def _powers(length: int) -> np.ndarray:
+    """Powers 1, P, P**2, ... of the polynomial hash multiplier, at least `length` of them."""
+    global _POWERS
+    # Built in a local and published with a single assignment, so concurrent callers only
+    # ever see a complete table; each caller returns the table it checked or built
+    powers = _POWERS
+    if len(powers) < length:
+        size = max(length, 2 * len(powers))
+        powers = np.ones(size, dtype=np.uint64)
+        np.cumprod(np.full(size - 1, _WORD_MULTIPLIER, dtype=np.uint64), dtype=np.uint64, out=powers[1:])
+        _POWERS = powers
+    return powers
+
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    """32-bit avalanche finalizer (MurmurHash3 fmix32) applied elementwise."""
+    values = values & _MASK32
+    values ^= values >> np.uint64(16)
+    values = (values * np.uint64(0x85EBCA6B)) & _MASK32
+    values ^= values >> np.uint64(13)
+    values = (values * np.uint64(0xC2B2AE35)) & _MASK32
+    values ^= values >> np.uint64(16)
+    return values
+
+
+def ngram_hashes(words: Sequence[str], previous: Optional[str] = None) -> np.ndarray:
+    """
+    Hash the unigrams and bigrams of a word sequence.
+
+    Args:
+        words: Lower-cased words in document order
+        previous: Word preceding the sequence, so the bigram spanning a cut between two
+            pieces of a document is hashed as well
+
+    Returns:
+        uint64 array of 32-bit n-gram hashes
+    """
+    if previous is not None:
+        hashes = _word_hashes([previous, *words])
+        unigrams = hashes[1:]
+    else:
+        hashes = _word_hashes(words)
+        unigrams = hashes
+    bigrams = hashes[:-1] * _BIGRAM_MULTIPLIER + hashes[1:]
+    return _mix(np.concatenate((unigrams, bigrams)))
+
+
+class SparseBatch:
+    """
+    CSR matrix of hashed n-gram features for a batch of documents.
+
+    Row i spans indices[indptr[i]:indptr[i + 1]] and the matching data; columns within
+    a row are unique and sorted.
+    """
+
+    __slots__ = ("indptr", "indices", "data", "num_columns")
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, num_columns: int) -> None:
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.num_columns = num_columns
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    def row_ids(self) -> np.ndarray:
+        """Row index of every stored value."""
+        return np.repeat(np.arange(len(self), dtype=np.intp), np.diff(self.indptr))
+
+    def dot(self, weights: np.ndarray) -> np.ndarray:
+        """
+        Multiply every row with a weight vector.
+
+        Args:
+            weights: Array of shape (num_columns,)
+
+        Returns:
+            float32 array of shape (len(self),)
+        """
+        products = self.data * weights[self.indices]
+        return np.bincount(self.row_ids(), weights=products, minlength=len(self)).astype(np.float32)
+
+    def take(self, rows: np.ndarray) -> "SparseBatch":
+        """Select a subset of rows, in the given order."""
+        starts = self.indptr[rows]
+        lengths = self.indptr[rows + 1] - starts
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        positions = np.repeat(starts - indptr[:-1], lengths) + np.arange(indptr[-1], dtype=np.int64)
+        return SparseBatch(indptr, self.indices[positions], self.data[positions], self.num_columns)
+
+
+def _signed_columns(hashes: np.ndarray, bits: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Map n-gram hashes to (column, sign); the sign uses the bit above the column bits."""
+    columns = (hashes & np.uint64((1 << bits) - 1)).astype(np.int64)
+    signs = np.where((hashes >> np.uint64(bits)) & np.uint64(1), -1.0, 1.0).astype(np.float32)
+    return columns, signs
+
+
+def hash_documents(texts: Sequence[str], bits: int = DEFAULT_HASH_BITS) -> SparseBatch:
+    """
+    Hash a batch of documents into a CSR matrix.
+
+    The words of the whole batch are hashed in one pass and (row, column) pairs are
+    deduplicated with a single sort, so the per-document Python work is tokenization.
+
+    Args:
+        texts: Documents to hash
+        bits: log2 of the number of columns (at most 31)
+
+    Returns:
+        SparseBatch with signed n-gram counts divided by each document's word count
+    """
+    word_lists = [WORD_RE.findall(text.lower()) for text in texts]
+    word_counts = np.fromiter(map(len, word_lists), dtype=np.int64, count=len(word_lists))
+    hashes = _word_hashes(list(chain.from_iterable(word_lists)))
+    word_rows = np.repeat(np.arange(len(texts), dtype=np.int64), word_counts)
+
+    # Bigrams pair each word with its successor inside the same document
+    same_row = word_rows[:-1] == word_rows[1:]
+    bigrams = (hashes[:-1] * _BIGRAM_MULTIPLIER + hashes[1:])[same_row]
+    rows = np.concatenate((word_rows, word_rows[:-1][same_row]))
+    columns, signs = _signed_columns(_mix(np.concatenate((hashes, bigrams))), bits)
+
+    # Sorting (row, column) keys groups repeated n-grams and orders the CSR rows
+    keys, inverse = np.unique((rows << bits) | columns, return_inverse=True)
+    values = np.bincount(inverse, weights=signs, minlength=len(keys))
+    key_rows = keys >> bits
+    values /= np.maximum(word_counts[key_rows], 1)
+    nonzero = values != 0
+
+    indptr = np.zeros(len(texts) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(key_rows[nonzero], minlength=len(texts)), out=indptr[1:])
+    indices = keys[nonzero] & ((1 << bits) - 1)
+    return SparseBatch(indptr, indices, values[nonzero].astype(np.float32), 1 << bits)
+
+
+class NgramChannel:
+    """
+    Learned weights over hashed n-grams, added to the detector's logit.
+
+    Weights may be a read-only memory map, so pre-fork workers share one copy.
+    """
+
+    def __init__(self, weights: np.ndarray) -> None:
+        """
+        Wrap a weight vector.
+
+        Args:
+            weights: float32 array whose length is a power of two
+        """
+        bits = len(weights).bit_length() - 1
+        if len(weights) != 1 << bits:
+            raise ValueError("n-gram weight vector length must be a power of two")
+        self.weights = weights
+        self.bits = bits
+        self.digest = hashlib.blake2b(np.ascontiguousarray(weights).tobytes(), digest_size=8).hexdigest()
+
+    @classmethod
+    def load(cls, path: str) -> "NgramChannel":
+        """Memory-map a weight vector saved with np.save."""
+        return cls(np.load(path, mmap_mode="r"))
+
+    def score(self, text: str) -> float:
+        """Logit contribution of one document."""
+        weighted, words, _ = self.partial_score(text)
+        return weighted / max(words, 1)
+
+    def score_batch(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Logit contributions of a batch of documents.
+
+        Returns:
+            float32 array of shape (len(texts),)
+        """
+        return hash_documents(texts, self.bits).dot(self.weights)
+
+    def bigram_weight(self, previous: str, word: str) -> float:
+        """
+        Weighted count of the single bigram (previous, word).
+
+        Used to join the partial scores of pieces that were scored independently.
+        """
+        hashes = _word_hashes([previous, word])
+        bigram = hashes[:-1] * _BIGRAM_MULTIPLIER + hashes[1:]
+        columns, signs = _signed_columns(_mix(bigram), self.bits)
+        return float(np.dot(signs, self.weights[columns]))
+
+    def partial_score(self, text: str, previous: Optional[str] = None) -> Tuple[float, int, Optional[str]]:
+        """
+        Additive contribution of one piece of a longer document.
+
+        Summing the weighted counts and word counts of consecutive pieces (passing the
+        last word of each piece on as previous) and dividing gives score() of the
+        whole document.
+
+        Returns:
+            Tuple of (weighted n-gram count, word count, last word of the piece)
+        """
+        words = WORD_RE.findall(text.lower())
+        if not words:
+            return 0.0, 0, previous
+        columns, signs = _signed_columns(ngram_hashes(words, previous), self.bits)
+        weighted = float(np.dot(signs, self.weights[columns]))
+        return weighted, len(words), words[-1]
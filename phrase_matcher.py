@@ -0,0 +1,162 @@
+"""
+Multi-word phrase matching for the fake news detector.
+A word-level Aho-Corasick automaton that matches every lexicon phrase in a single pass over the text.
+"""
+
+import re
+from collections import deque
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+# Words are runs of word characters, optionally joined by inner hyphens or apostrophes,
+# so "SHOCKING!" yields "shocking" and "mind-blowing" stays one word.
+WORD_RE = re.compile(r"\w+(?:[-']\w+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lower-cased words, dropping surrounding punctuation.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of words
+    """
+    return WORD_RE.findall(text.lower())
+
+
+class PhraseMatcher:
+    """
+    Aho-Corasick automaton over words rather than characters.
+
+    Each lexicon entry is tokenized into a word sequence and inserted into a trie whose
+    edges are whole words; failure links make the scan a single left-to-right pass.
+    Matching is case-insensitive and always aligned to word boundaries. Scan cost depends
+    on text length and the number of matches, not on how many phrases were compiled.
+    """
+
+    def __init__(self, lexicons: Sequence[Sequence[str]]) -> None:
+        """
+        Compile the automaton.
+
+        Args:
+            lexicons: One phrase list per label; a match of a phrase from lexicons[i]
+                counts towards label i
+        """
+        self.num_labels = len(lexicons)
+
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[Tuple[int, int]]] = [[]]
+
+        # Build the trie; outputs hold (label, phrase length in words)
+        for label, lexicon in enumerate(lexicons):
+            for phrase in set(lexicon):
+                words = tokenize(phrase)
+                if not words:
+                    continue
+                state = 0
+                for word in words:
+                    next_state = goto[state].get(word)
+                    if next_state is None:
+                        next_state = len(goto)
+                        goto[state][word] = next_state
+                        goto.append({})
+                        outputs.append([])
+                    state = next_state
+                if (label, len(words)) not in outputs[state]:
+                    outputs[state].append((label, len(words)))
+
+        # Breadth-first pass computing failure links and merging inherited outputs
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and word not in goto[fallback]:
+                    fallback = fail[fallback]
+                target = goto[fallback].get(word, 0)
+                fail[next_state] = target if target != next_state else 0
+                outputs[next_state].extend(outputs[fail[next_state]])
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = [tuple(output) for output in outputs]
+        self.num_states = len(goto)
+
+    def _scan(self, words: Sequence[str]) -> Iterator[Tuple[int, int, int]]:
+        """Yield (start word index, end word index, label) for every match."""
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        state = 0
+        for index, word in enumerate(words):
+            next_state = goto[state].get(word)
+            while next_state is None and state:
+                state = fail[state]
+                next_state = goto[state].get(word)
+            state = next_state or 0
+            for label, length in outputs[state]:
+                yield index - length + 1, index + 1, label
+
+    def count(self, text: str) -> List[int]:
+        """
+        Count phrase matches per label.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            List with the number of matches for every label
+        """
+        counts = [0] * self.num_labels
+        self.count_into(text, counts)
+        return counts
+
+    def count_into(self, text: str, counts: List[int], state: int = 0) -> int:
+        """
+        Add the phrase matches of a piece of text to running counts.
+
+        Feeding consecutive pieces of a document (cut between words) with the state
+        returned by the previous call counts phrases that span the cuts as well.
+
+        Args:
+            text: Text to scan
+            counts: Per-label counts, updated in place
+            state: Automaton state returned for the preceding piece (0 at the start)
+
+        Returns:
+            Automaton state after the last word of the piece
+        """
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        root = goto[0]
+        # Inlined copy of _scan: this runs once per detection on the hot path
+        for word in WORD_RE.findall(text.lower()):
+            if state:
+                next_state = goto[state].get(word)
+                while next_state is None and state:
+                    state = fail[state]
+                    next_state = goto[state].get(word)
+                state = next_state or 0
+            else:
+                state = root.get(word, 0)
+            if state:
+                for label, _ in outputs[state]:
+                    counts[label] += 1
+        return state
+
+    def find(self, text: str) -> List[Tuple[str, int]]:
+        """
+        List every match with the matched words.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            List of (matched phrase, label) tuples in scan order
+        """
+        words = tokenize(text)
+        return [(" ".join(words[start:end]), label) for start, end, label in self._scan(words)]
@@ -0,0 +1,276 @@
+"""
+Response encoding for the fake news web API.
+Field selection, compact results, content negotiation (JSON or MessagePack) and response compression.
+
+Clients pick what they receive:
+
+    POST /api/detect?fields=is_fake,confidence_score     only these result fields
+    POST /api/detect?compact=1                           no features, rounded scores
+    Accept: application/msgpack                          MessagePack body (needs msgpack)
+    Accept-Encoding: gzip                                gzip bodies above COMPRESSION_MIN_SIZE
+
+JSON is encoded with orjson when it is installed (see OrjsonProvider) and with the
+standard library otherwise.
+"""
+
+import gzip
+import os
+from typing import Any, Dict, FrozenSet, Optional
+
+from flask import Flask, Response, current_app, request
+from flask.json.provider import DefaultJSONProvider
+
+from main import DetectionResult, NewsArticle
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Fields of a detection result that can be requested with fields=
+DETECTION_FIELDS = ("is_fake", "confidence_score", "explanation", "features", "paragraph_scores", "duplicate_of")
+
+# Fields returned in compact mode when no fields= selector is given
+COMPACT_FIELDS = ("is_fake", "confidence_score", "explanation", "paragraph_scores", "duplicate_of")
+
+# Decimal places kept for scores and features in compact mode
+COMPACT_PRECISION = 4
+
+# Responses smaller than this many bytes are sent uncompressed
+COMPRESSION_MIN_SIZE = int(os.environ.get("FAKE_NEWS_COMPRESS_MIN_SIZE", "1024"))
+
+# gzip level; low levels already get most of the gain on repetitive JSON
+COMPRESSION_LEVEL = 5
+
+# Binary media types accepted for MessagePack
+MSGPACK_MIMETYPES = ("application/msgpack", "application/x-msgpack")
+
+# Media types worth compressing
+_COMPRESSIBLE = frozenset(("application/json", "text/plain", "text/html") + MSGPACK_MIMETYPES)
+
+
+class FieldSelection:
+    """Which detection result fields to return, and whether to round them."""
+
+    __slots__ = ("fields", "compact")
+
+    def __init__(self, fields: Optional[FrozenSet[str]] = None, compact: bool = False) -> None:
+        if fields is None:
+            fields = frozenset(COMPACT_FIELDS if compact else DETECTION_FIELDS)
+        self.fields = fields
+        self.compact = compact
+
+
+# Selection matching the historical full responses
+FULL_SELECTION = FieldSelection()
+
+
+def _truthy(value: Any) -> bool:
+    """Interpret a query or body flag."""
+    if isinstance(value, str):
+        return value.lower() in ("1", "true", "yes", "on")
+    return bool(value)
+
+
+def parse_selection(body: Any = None) -> FieldSelection:
+    """
+    Read fields= and compact= from the query string or the JSON body of the current request.
+
+    Args:
+        body: Parsed JSON body, if it is an object
+
+    Returns:
+        FieldSelection for the response
+
+    Raises:
+        ValueError: If an unknown field is requested
+    """
+    options = body if isinstance(body, dict) else {}
+    fields = request.args.get("fields", options.get("fields"))
+    compact = _truthy(request.args.get("compact", options.get("compact", False)))
+
+    if fields is None:
+        return FieldSelection(compact=compact) if compact else FULL_SELECTION
+    if isinstance(fields, str):
+        fields = [field.strip() for field in fields.split(",") if field.strip()]
+    if not isinstance(fields, list) or not all(isinstance(field, str) for field in fields):
+        raise ValueError("fields must be a comma-separated string or a list of strings")
+    unknown = set(fields) - set(DETECTION_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return FieldSelection(frozenset(fields), compact)
+
+
+def detection_to_dict(result: DetectionResult, selection: FieldSelection = FULL_SELECTION) -> Dict[str, Any]:
+    """
+    Convert a detection result to a JSON-serializable dict.
+
+    Args:
+        result: Detection result
+        selection: Fields to include and whether to round scores
+
+    Returns:
+        Dict with the selected fields; paragraph_scores and duplicate_of only appear when present
+    """
+    fields = selection.fields
+    output: Dict[str, Any] = {}
+    if "is_fake" in fields:
+        output["is_fake"] = result.is_fake
+    if "confidence_score" in fields:
+        output["confidence_score"] = result.confidence_score
+    if "explanation" in fields:
+        output["explanation"] = result.explanation
+    if "features" in fields:
+        output["features"] = result.features
+    if "paragraph_scores" in fields and result.paragraph_scores is not None:
+        output["paragraph_scores"] = result.paragraph_scores
+    if "duplicate_of" in fields and result.duplicate_of is not None:
+        output["duplicate_of"] = result.duplicate_of
+
+    if selection.compact:
+        digits = COMPACT_PRECISION
+        if "confidence_score" in output:
+            output["confidence_score"] = round(output["confidence_score"], digits)
+        if "features" in output:
+            output["features"] = {name: round(value, digits) for name, value in output["features"].items()}
+        if "paragraph_scores" in output:
+            output["paragraph_scores"] = [round(score, digits) for score in output["paragraph_scores"]]
+    return output
+
+
+def article_to_dict(article: NewsArticle, include_confidence: bool = True) -> Dict[str, Any]:
+    """
+    Convert a generated article to a JSON-serializable dict.
+
+    Args:
+        article: Generated article
+        include_confidence: Include the generator's confidence_score
+
+    Returns:
+        Dict of article fields with the publish date as YYYY-MM-DD
+    """
+    output = {
+        "title": article.title,
+        "content": article.content,
+        "author": article.author,
+        "source": article.source,
+        "publish_date": article.publish_date.strftime("%Y-%m-%d"),
+        "category": article.category,
+        "is_fake": article.is_fake
+    }
+    if include_confidence:
+        output["confidence_score"] = article.confidence_score
+    return output
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson.
+
+    Used for both request parsing and jsonify, producing the same documents as the
+    standard provider: dates and dataclasses are passed through to its default()
+    (HTTP dates, asdict) rather than orjson's own formats, and values orjson cannot
+    handle at all (very large integers, lone surrogates in request bodies) fall back
+    to the standard provider.
+    """
+
+    def _options(self) -> int:
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return options
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs.keys() - {"separators"}:
+            return super().dumps(obj, **kwargs)
+        try:
+            return orjson.dumps(obj, default=self.default, option=self._options()).decode("utf-8")
+        except TypeError:
+            return super().dumps(obj, **kwargs)
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            # orjson rejects \ud800-style escapes of lone surrogates, which json accepts
+            return super().loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(obj)
+        try:
+            body = orjson.dumps(obj, default=self.default, option=self._options() | orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            return super().response(obj)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def install(app: Flask) -> None:
+    """
+    Enable the fast JSON provider and response compression on an app.
+
+    The orjson provider is used when orjson is installed unless FAKE_NEWS_FAST_JSON=0.
+    """
+    if orjson is not None and os.environ.get("FAKE_NEWS_FAST_JSON", "1").lower() not in ("0", "false", "no", "off"):
+        app.json = OrjsonProvider(app)
+    app.after_request(compress_response)
+
+
+def api_response(payload: Any, status: int = 200) -> Response:
+    """
+    Encode an API payload in the representation preferred by the current request.
+
+    MessagePack is used when the Accept header prefers it and msgpack is installed;
+    otherwise the payload is encoded as JSON by the app's JSON provider.
+
+    Args:
+        payload: JSON-serializable payload
+        status: HTTP status code
+
+    Returns:
+        Response
+    """
+    if msgpack is not None:
+        best = request.accept_mimetypes.best_match(("application/json",) + MSGPACK_MIMETYPES)
+        if best in MSGPACK_MIMETYPES:
+            body = msgpack.packb(payload, use_bin_type=True)
+            response = current_app.response_class(body, status=status, mimetype=best)
+            response.vary.add("Accept")
+            return response
+
+    response = current_app.json.response(payload)
+    response.status_code = status
+    if msgpack is not None:
+        response.vary.add("Accept")
+    return response
+
+
+def compress_response(response: Response) -> Response:
+    """
+    Gzip a response body when the client accepts it and the body is large enough.
+
+    Registered as an after_request hook by install(); streamed, already encoded and
+    non-compressible responses pass through unchanged.
+    """
+    if (response.direct_passthrough or response.is_streamed or "Content-Encoding" in response.headers
+            or response.mimetype not in _COMPRESSIBLE or not 200 <= response.status_code < 300):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    if "gzip" not in request.accept_encodings:
+        return response
+
+    body = response.get_data()
+    if len(body) < COMPRESSION_MIN_SIZE:
+        return response
+    response.set_data(gzip.compress(body, compresslevel=COMPRESSION_LEVEL))
+    response.headers["Content-Encoding"] = "gzip"
+    return response
@@ -5,7 +5,6 @@ Run this file to start the web server.
 """
 
 import sys
-import subprocess
 import os
 
 def check_python_version():
@@ -16,17 +15,6 @@ def check_python_version():
         return False
     return True
 
-def install_requirements():
-    """Install required packages."""
-    try:
-        print("📦 Installing required packages...")
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
-        print("✅ Packages installed successfully")
-        return True
-    except subprocess.CalledProcessError:
-        print("❌ Error installing packages")
-        return False
-
 def main():
     """Main startup function."""
     print("🤖 Fake News Generator and Detector Web App")
@@ -36,14 +24,13 @@ def main():
     if not check_python_version():
         sys.exit(1)
     
-    # Check if Flask is installed
+    # Check if Flask is installed (startup never installs packages itself)
     try:
         import flask
-        print("✅ Flask is already installed")
     except ImportError:
-        print("📦 Flask not found, installing requirements...")
-        if not install_requirements():
-            sys.exit(1)
+        print("❌ Error: Flask is not installed")
+        print("Install the dependencies with: pip install -r requirements.txt")
+        sys.exit(1)
     
     # Check if main.py exists
     if not os.path.exists("main.py"):
@@ -65,7 +52,12 @@ def main():
     
     try:
         # Import and run the Flask app
-        from app import app
+        from app import app, start_lexicon_watcher, warm_up
+        from logging_config import configure_logging
+        
+        configure_logging()
+        warm_up()
+        start_lexicon_watcher()
         app.run(host="0.0.0.0", port=5000, debug=True)
     except KeyboardInterrupt:
         print("\n👋 Server stopped by user")
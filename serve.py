@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Fake News Generator and Detector Production Server
+Serves the Flask app from a pre-fork, multi-worker, multi-threaded gunicorn server.
+
+The app is loaded and warmed up (building the FakeNewsGenerator and FakeNewsDetector)
+once in the master process before workers are forked, so every worker shares those pages
+copy-on-write.
+
+Usage:
+    python serve.py --workers 8 --threads 4 --bind 0.0.0.0:8000
+
+Every option can also be set through the environment (e.g. FAKE_NEWS_WORKERS=8).
+"""
+
+import argparse
+import gc
+import multiprocessing
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:  # gunicorn is optional; only needed to serve in production
+    BaseApplication = object
+
+
+def _env(name: str, default: Any) -> Any:
+    """Read a FAKE_NEWS_* environment override, converted to the default's type."""
+    value = os.environ.get(f"FAKE_NEWS_{name}")
+    return default if value is None else type(default)(value)
+
+
+class ProductionServer(BaseApplication):
+    """Gunicorn application that preloads app.py in the master process."""
+
+    def __init__(self, options: Dict[str, Any]) -> None:
+        """
+        Initialize the server.
+
+        Args:
+            options: Gunicorn settings (bind, workers, threads, keepalive, ...)
+        """
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        """Apply the configured options to the gunicorn config."""
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key, value)
+
+    def load(self) -> Any:
+        """Import the Flask app and freeze the heap before workers fork."""
+        from logging_config import configure_logging
+
+        # Workers inherit the queue but not the listener thread, so logging is
+        # configured again in each worker by post_worker_init.
+        configure_logging()
+        from app import app, warm_up
+
+        # Engine objects are built here rather than lazily in each worker, so their
+        # pages are shared across the fork; the threads that use them (lexicon watcher,
+        # article pool refill) are only started in the workers by post_worker_init
+        warm_up()
+
+        # Objects created so far (templates, lexicon tables, Flask internals) are moved
+        # out of the collector's reach so GC passes in workers don't touch, and thereby
+        # copy, the pages they share with the master.
+        gc.freeze()
+        return app
+
+
+def _post_worker_init(worker: Any) -> None:
+    """Start the logging listener, lexicon watcher and article pool threads in a freshly forked worker."""
+    from app import get_article_pool, start_lexicon_watcher
+    from logging_config import configure_logging
+
+    configure_logging()
+    start_lexicon_watcher()
+    get_article_pool()
+
+
+def build_options(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Translate command line arguments into gunicorn settings.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        Dict of gunicorn settings
+    """
+    return {
+        "bind": args.bind,
+        "workers": args.workers,
+        "threads": args.threads,
+        "worker_class": "gthread",
+        "keepalive": args.keepalive,
+        "timeout": args.timeout,
+        "graceful_timeout": args.graceful_timeout,
+        "max_requests": args.max_requests,
+        "max_requests_jitter": args.max_requests // 10 if args.max_requests else 0,
+        "backlog": args.backlog,
+        "preload_app": True,
+        "accesslog": args.access_log,
+        "post_worker_init": _post_worker_init
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser."""
+    cpu_count = multiprocessing.cpu_count()
+    parser = argparse.ArgumentParser(description="Serve the Fake News web app in production")
+    parser.add_argument("--bind", default=_env("BIND", "0.0.0.0:5000"), help="Address to listen on")
+    parser.add_argument("--workers", type=int, default=_env("WORKERS", cpu_count),
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument("--threads", type=int, default=_env("THREADS", 4), help="Threads per worker")
+    parser.add_argument("--keepalive", type=int, default=_env("KEEPALIVE", 5),
+                        help="Seconds to hold idle keep-alive connections")
+    parser.add_argument("--timeout", type=int, default=_env("TIMEOUT", 30),
+                        help="Seconds before a silent worker is killed and restarted")
+    parser.add_argument("--graceful-timeout", type=int, default=_env("GRACEFUL_TIMEOUT", 30),
+                        help="Seconds workers get to finish in-flight requests on shutdown")
+    parser.add_argument("--max-requests", type=int, default=_env("MAX_REQUESTS", 0),
+                        help="Recycle workers after this many requests (0 disables)")
+    parser.add_argument("--backlog", type=int, default=_env("BACKLOG", 2048), help="Pending connection queue size")
+    parser.add_argument("--access-log", default=os.environ.get("FAKE_NEWS_ACCESS_LOG"),
+                        help="Access log file, or - for stderr (default: disabled)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Production server entry point."""
+    args = build_parser().parse_args(argv)
+
+    if BaseApplication is object:
+        print("❌ Error: gunicorn is required for production serving")
+        print("Install it with: pip install gunicorn")
+        sys.exit(1)
+
+    print("🤖 Fake News Generator and Detector Web App (production)")
+    print(f"🌐 Serving on http://{args.bind} with {args.workers} workers x {args.threads} threads")
+    ProductionServer(build_options(args)).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+Streaming input support for the fake news detector.
+Mergeable feature counters and chunk splitting for documents too large to hold in memory as one string.
+
+FakeNewsDetector.detect_stream feeds a document through these pieces: chunks are cut at
+whitespace so no token straddles two pieces, each piece is counted on its own, and the
+counters are added up. Memory stays proportional to the chunk size plus the vocabulary
+estimator, which is exact up to a configurable number of distinct words and a fixed-size
+HyperLogLog sketch beyond that.
+"""
+
+import codecs
+import hashlib
+import math
+from typing import IO, TYPE_CHECKING, Iterable, Iterator, List, Optional, Set, Union
+
+if TYPE_CHECKING:
+    from ngrams import NgramChannel
+
+# Characters read per chunk from file objects
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Distinct words counted exactly before the vocabulary switches to an estimate
+DEFAULT_MAX_EXACT_VOCABULARY = 100000
+
+# HyperLogLog precision: 2**14 one-byte registers, about 0.8% standard error
+_HLL_PRECISION = 14
+_HLL_REGISTERS = 1 << _HLL_PRECISION
+_HLL_ALPHA = 0.7213 / (1 + 1.079 / _HLL_REGISTERS)
+
+Source = Union[str, bytes, IO, Iterable[Union[str, bytes]]]
+
+
+class VocabularyCounter:
+    """
+    Counts distinct words, exactly while small and approximately once large.
+
+    Words are kept in a set until it holds max_exact entries; the set is then folded
+    into a HyperLogLog sketch with fixed memory. Counters over different parts of a
+    document merge into the distinct count of the whole.
+    """
+
+    __slots__ = ("max_exact", "_words", "_registers")
+
+    def __init__(self, max_exact: int = DEFAULT_MAX_EXACT_VOCABULARY) -> None:
+        self.max_exact = max_exact
+        self._words: Optional[Set[str]] = set()
+        self._registers: Optional[bytearray] = None
+
+    @property
+    def exact(self) -> bool:
+        """Whether the count is still exact."""
+        return self._registers is None
+
+    def add(self, words: Iterable[str]) -> None:
+        """Record a collection of words (duplicates are fine)."""
+        if self._registers is None:
+            self._words.update(words)
+            if len(self._words) > self.max_exact:
+                self._to_sketch()
+        else:
+            self._add_hashed(words)
+
+    def merge(self, other: "VocabularyCounter") -> None:
+        """Fold another counter into this one."""
+        if other._registers is None:
+            self.add(other._words)
+            return
+        if self._registers is None:
+            self._to_sketch()
+        self._registers = bytearray(map(max, self._registers, other._registers))
+
+    def __len__(self) -> int:
+        """Distinct word count (an estimate once the exact limit was exceeded)."""
+        if self._registers is None:
+            return len(self._words)
+
+        registers = self._registers
+        estimate = _HLL_ALPHA * _HLL_REGISTERS * _HLL_REGISTERS / sum(2.0 ** -rank for rank in registers)
+        zeros = registers.count(0)
+        if estimate <= 2.5 * _HLL_REGISTERS and zeros:
+            estimate = _HLL_REGISTERS * math.log(_HLL_REGISTERS / zeros)
+        return int(round(estimate))
+
+    def _to_sketch(self) -> None:
+        """Switch from the exact set to the sketch."""
+        words = self._words
+        self._words = None
+        self._registers = bytearray(_HLL_REGISTERS)
+        self._add_hashed(words)
+
+    def _add_hashed(self, words: Iterable[str]) -> None:
+        registers = self._registers
+        mask = _HLL_REGISTERS - 1
+        width = 64 - _HLL_PRECISION
+        for word in words:
+            value = int.from_bytes(
+                hashlib.blake2b(word.encode("utf-8", "surrogatepass"), digest_size=8).digest(), "little"
+            )
+            index = value & mask
+            rank = width - (value >> _HLL_PRECISION).bit_length() + 1
+            if rank > registers[index]:
+                registers[index] = rank
+
+
+class FeatureCounts:
+    """
+    Additive counters behind the detector's features.
+
+    Each instance covers a stretch of text cut at whitespace; merging the counts of
+    consecutive stretches gives the counts of their concatenation. Sentences are tracked
+    as (head, inner, tail) so a sentence running across a cut is counted once.
+    """
+
+    __slots__ = (
+        "word_count", "class_counts", "lexicon_counts",
+        "exclamations", "questions", "quotes", "vocabulary",
+        "separated", "sentence_head", "sentence_inner", "sentence_tail",
+        "ngram_weight", "ngram_words", "ngram_first", "ngram_last"
+    )
+
+    def __init__(self, num_classes: int, max_exact_vocabulary: int = DEFAULT_MAX_EXACT_VOCABULARY) -> None:
+        self.word_count = 0
+        self.class_counts = [0] * num_classes
+        self.lexicon_counts: Optional[List[int]] = None
+        self.exclamations = 0
+        self.questions = 0
+        self.quotes = 0
+        self.vocabulary = VocabularyCounter(max_exact_vocabulary)
+        # Sentence state: whether a separator was seen, whether the text before the
+        # first separator is non-blank, complete sentences in between, and whether the
+        # text after the last separator is non-blank
+        self.separated = False
+        self.sentence_head = False
+        self.sentence_inner = 0
+        self.sentence_tail = False
+        # Hashed n-gram channel: weighted n-gram count, word count, and the first and
+        # last lower-cased words, which form the bigrams across a merge (see ngrams.py)
+        self.ngram_weight = 0.0
+        self.ngram_words = 0
+        self.ngram_first: Optional[str] = None
+        self.ngram_last: Optional[str] = None
+
+    def add_segments(self, segments: List[str]) -> None:
+        """
+        Record the pieces of a stretch of text split on sentence separators.
+
+        Args:
+            segments: Result of SENTENCE_SPLIT_RE.split over the stretch
+        """
+        first = bool(segments[0].strip())
+        if len(segments) == 1:
+            if self.separated:
+                self.sentence_tail = self.sentence_tail or first
+            else:
+                self.sentence_head = self.sentence_head or first
+            return
+
+        if self.separated:
+            self.sentence_inner += self.sentence_tail or first
+        else:
+            self.sentence_head = self.sentence_head or first
+            self.separated = True
+        self.sentence_inner += sum(1 for segment in segments[1:-1] if segment.strip())
+        self.sentence_tail = bool(segments[-1].strip())
+
+    @property
+    def ngram_score(self) -> float:
+        """Contribution of the hashed n-gram channel (0.0 when it is disabled)."""
+        return self.ngram_weight / max(self.ngram_words, 1)
+
+    @property
+    def sentence_count(self) -> int:
+        """Number of non-blank sentences."""
+        if not self.separated:
+            return int(self.sentence_head)
+        return self.sentence_head + self.sentence_inner + self.sentence_tail
+
+    def merge(self, other: "FeatureCounts", ngram_channel: Optional["NgramChannel"] = None) -> None:
+        """
+        Append the counts of the text directly following this one.
+
+        Lexicon phrase counts are summed, so phrases spanning the cut between the two
+        stretches are not counted; sequential streaming carries the matcher state across
+        cuts instead. The bigram spanning the cut is added when the n-gram channel the
+        counts were made with is passed.
+
+        Args:
+            other: Counts of the following stretch
+            ngram_channel: NgramChannel used for both stretches, if any
+        """
+        self.word_count += other.word_count
+        self.ngram_weight += other.ngram_weight
+        self.ngram_words += other.ngram_words
+        if ngram_channel is not None and self.ngram_last is not None and other.ngram_first is not None:
+            self.ngram_weight += ngram_channel.bigram_weight(self.ngram_last, other.ngram_first)
+        self.ngram_first = self.ngram_first or other.ngram_first
+        self.ngram_last = other.ngram_last or self.ngram_last
+        self.class_counts = [a + b for a, b in zip(self.class_counts, other.class_counts)]
+        if other.lexicon_counts is not None:
+            if self.lexicon_counts is None:
+                self.lexicon_counts = list(other.lexicon_counts)
+            else:
+                self.lexicon_counts = [a + b for a, b in zip(self.lexicon_counts, other.lexicon_counts)]
+        self.exclamations += other.exclamations
+        self.questions += other.questions
+        self.quotes += other.quotes
+        self.vocabulary.merge(other.vocabulary)
+
+        if not other.separated:
+            if self.separated:
+                self.sentence_tail = self.sentence_tail or other.sentence_head
+            else:
+                self.sentence_head = self.sentence_head or other.sentence_head
+            return
+        if self.separated:
+            self.sentence_inner += other.sentence_inner + (self.sentence_tail or other.sentence_head)
+        else:
+            self.sentence_head = self.sentence_head or other.sentence_head
+            self.sentence_inner = other.sentence_inner
+            self.separated = True
+        self.sentence_tail = other.sentence_tail
+
+
+def iter_chunks(source: Source, chunk_size: int = DEFAULT_CHUNK_SIZE, encoding: str = "utf-8") -> Iterator[str]:
+    """
+    Read a document as text chunks.
+
+    Args:
+        source: A string, a file object (text or binary) or an iterable of str/bytes chunks
+        chunk_size: Characters (or bytes) read per chunk from file objects
+        encoding: Encoding of byte input; multi-byte characters split across chunks are
+            reassembled
+
+    Yields:
+        Text chunks
+    """
+    if isinstance(source, (str, bytes)):
+        source = (source,)
+    elif hasattr(source, "read"):
+        handle = source
+        source = iter(lambda: handle.read(chunk_size), handle.read(0))
+
+    decoder = None
+    for chunk in source:
+        if isinstance(chunk, (bytes, bytearray, memoryview)):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder(encoding)()
+            chunk = decoder.decode(chunk)
+        if chunk:
+            yield chunk
+    if decoder is not None:
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+
+def whitespace_pieces(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Re-cut text chunks so that every piece ends at whitespace.
+
+    The text after the last whitespace of a chunk is carried over to the next one, so
+    tokens split across chunk boundaries are rejoined. A single token longer than a
+    chunk is held until its end is seen.
+
+    Args:
+        chunks: Text chunks in document order
+
+    Yields:
+        Pieces whose concatenation equals the input
+    """
+    carry = ""
+    for chunk in chunks:
+        if carry:
+            chunk = carry + chunk
+            carry = ""
+        if chunk[-1].isspace():
+            yield chunk
+            continue
+        # rsplit scans from the right, so this costs the length of the trailing token
+        index = len(chunk) - len(chunk.rsplit(None, 1)[-1])
+        if index == 0:
+            carry = chunk
+            continue
+        yield chunk[:index]
+        carry = chunk[index:]
+    if carry:
+        yield carry
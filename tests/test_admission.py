@@ -0,0 +1,141 @@
+"""
+Tests for admission control.
+Small controllers must admit cheap requests first, shed with 429 + Retry-After and always free their slots.
+"""
+
+import threading
+import time
+from typing import Callable, List
+
+import pytest
+
+import app as web
+from admission import AdmissionController, Rejected
+
+
+def _wait_for(condition: Callable[[], bool], timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def _queue_depth(controller: AdmissionController) -> int:
+    return controller.stats()["queue_depth"]
+
+
+@pytest.fixture
+def client():
+    return web.app.test_client()
+
+
+@pytest.fixture
+def small_controller(monkeypatch) -> Callable[[str], AdmissionController]:
+    """Install a one-slot controller without a queue on a route for the duration of a test."""
+    def install(route: str) -> AdmissionController:
+        controller = AdmissionController(max_concurrent=1, max_queue=0, queue_timeout=0.05)
+        monkeypatch.setitem(web.ADMISSION, route, controller)
+        return controller
+    return install
+
+
+def test_cheaper_waiters_are_admitted_first() -> None:
+    controller = AdmissionController(max_concurrent=1, max_queue=4, queue_timeout=5.0)
+    controller.acquire()
+    order: List[int] = []
+
+    def request(cost: int) -> None:
+        controller.acquire(cost)
+        order.append(cost)
+        controller.release()
+
+    threads = []
+    for cost in (300, 100, 200):
+        threads.append(threading.Thread(target=request, args=(cost,)))
+        threads[-1].start()
+        _wait_for(lambda: _queue_depth(controller) == len(threads))
+
+    controller.release()
+    for thread in threads:
+        thread.join()
+    assert order == [100, 200, 300]
+    assert controller.stats()["active"] == 0
+
+
+def test_waiter_times_out() -> None:
+    controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=0.05)
+    controller.acquire()
+    with pytest.raises(Rejected) as rejected:
+        controller.acquire()
+    assert rejected.value.reason == "timeout"
+    assert rejected.value.retry_after >= 1
+    stats = controller.stats()
+    assert (stats["queue_depth"], stats["rejected_timeout"], stats["active"]) == (0, 1, 1)
+
+
+def test_full_queue_sheds_the_largest_request() -> None:
+    controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=5.0)
+    controller.acquire()
+    reasons: List[str] = []
+
+    def request(cost: int) -> None:
+        try:
+            controller.acquire(cost)
+            controller.release()
+        except Rejected as e:
+            reasons.append(e.reason)
+
+    large = threading.Thread(target=request, args=(100,))
+    large.start()
+    _wait_for(lambda: _queue_depth(controller) == 1)
+
+    with pytest.raises(Rejected) as rejected:
+        controller.acquire(200)
+    assert rejected.value.reason == "queue_full"
+
+    small = threading.Thread(target=request, args=(10,))
+    small.start()
+    large.join()
+    assert reasons == ["displaced"]
+
+    controller.release()
+    small.join()
+    assert reasons == ["displaced"]
+    assert controller.stats()["active"] == 0
+
+
+def test_busy_route_returns_429_with_retry_after(client, small_controller) -> None:
+    controller = small_controller("/api/detect")
+    controller.acquire()
+    response = client.post("/api/detect", json={"content": "Scientists publish a peer-reviewed study."})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert response.get_json()["success"] is False
+    assert controller.stats()["rejected_queue_full"] == 1
+
+    controller.release()
+    response = client.post("/api/detect", json={"content": "Scientists publish a peer-reviewed study."})
+    assert response.status_code == 200
+
+
+def test_slot_is_released_on_teardown(client, small_controller) -> None:
+    controller = small_controller("/api/detect")
+    assert client.post("/api/detect", json={"content": "Officials confirmed the report."}).status_code == 200
+    # Failing requests release their slot as well
+    assert client.post("/api/detect", json={}).status_code == 400
+    assert client.post("/api/detect", data="not json", content_type="application/json").status_code >= 400
+    stats = controller.stats()
+    assert (stats["active"], stats["admitted"]) == (0, 3)
+
+
+def test_stream_holds_its_slot_until_closed(client, small_controller) -> None:
+    controller = small_controller("/api/generate/stream")
+    response = client.get("/api/generate/stream?count=1000&seed=1", buffered=False)
+    assert response.status_code == 200
+    next(iter(response.response))
+    assert controller.stats()["active"] == 1
+    assert client.get("/api/generate/stream?count=1").status_code == 429
+
+    response.close()
+    assert controller.stats()["active"] == 0
+    assert client.get("/api/generate/stream?count=1").status_code == 200
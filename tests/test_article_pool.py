@@ -0,0 +1,50 @@
+"""
+Tests for the pre-generated article pool.
+Refills must honour the low-water mark, and random picks must not touch the global RNG.
+"""
+
+import random
+import time
+
+from article_pool import ArticlePool
+
+
+def _wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+def test_refills_only_below_low_water() -> None:
+    pool = ArticlePool(capacity=10, low_water=2, refill_rate=0)
+    pool.start()
+    try:
+        assert _wait_for(lambda: pool.stats()["size"] == 10 * len(pool.categories))
+        assert pool.get("clickbait") is not None
+        # Idle ticks (one per second) leave a buffer at or above the mark alone
+        time.sleep(1.5)
+        assert pool.stats()["size_clickbait"] == 9
+
+        for _ in range(8):
+            assert pool.get("clickbait") is not None
+        assert _wait_for(lambda: pool.stats()["size_clickbait"] == 10)
+    finally:
+        pool.stop()
+
+
+def test_random_picks_leave_global_rng_alone() -> None:
+    pool = ArticlePool(capacity=4, refill_rate=0)
+    state = random.getstate()
+    for _ in range(20):
+        pool.get()
+    assert random.getstate() == state
+    assert pool.stats()["misses"] == 20
+
+
+def test_low_water_is_clamped() -> None:
+    assert ArticlePool(capacity=1).low_water == 1
+    assert ArticlePool(capacity=4, low_water=0).low_water == 1
+    assert ArticlePool(capacity=4, low_water=9).low_water == 4
@@ -0,0 +1,51 @@
+"""
+Tests for the detection result cache.
+Cache keys must accept any text the detector accepts, including lone surrogates.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from cache import DetectionCache, content_key
+from main import FakeNewsDetector
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SURROGATE_TEXT = "hello \ud800 world"
+
+
+def test_content_key_accepts_lone_surrogates() -> None:
+    assert content_key(SURROGATE_TEXT, "f") == content_key("hello  \ud800\nworld", "f")
+    assert content_key(SURROGATE_TEXT) != content_key("hello \ud801 world")
+
+
+def test_cached_detection_scores_lone_surrogates() -> None:
+    cache = DetectionCache(max_size=4)
+    detector = FakeNewsDetector(cache=cache)
+    first = detector.detect_fake_news(SURROGATE_TEXT)
+    second = detector.detect_fake_news(SURROGATE_TEXT)
+    assert first.confidence_score == second.confidence_score == 0.0
+    assert cache.stats()["hits"] == 1
+
+
+# The \ud800 escape decodes to a lone surrogate (orjson rejects it, so its provider falls back)
+_API_CHECK = """
+import json
+import app
+response = app.app.test_client().post(
+    "/api/detect", data='{"content": "hello \\\\ud800 world"}', content_type="application/json"
+)
+print(json.dumps([response.status_code, response.get_json()["result"]["confidence_score"]]))
+"""
+
+
+@pytest.mark.parametrize("fast_json", ["0", "1"])
+def test_api_detect_scores_lone_surrogates(fast_json: str) -> None:
+    env = dict(os.environ, FAKE_NEWS_FAST_JSON=fast_json)
+    output = subprocess.run([sys.executable, "-c", _API_CHECK], cwd=ROOT, env=env, check=True,
+                            capture_output=True, text=True).stdout
+    assert json.loads(output.splitlines()[-1]) == [200, 0.0]
@@ -0,0 +1,176 @@
+"""
+Parity tests for the fake news detector.
+Checks the single-pass and vectorized detectors against the original scalar scoring.
+
+BaselineDetector below is the feature extraction, scoring and explanation code of the
+detector before the lexicon tables were precompiled, kept as the reference that every
+faster path has to reproduce.
+"""
+
+import random
+import re
+from typing import Dict, List
+
+import pytest
+
+from main import FakeNewsDetector, FakeNewsGenerator
+
+# Largest difference allowed between reference and detector scores
+TOLERANCE = 1e-6
+
+
+class BaselineDetector:
+    """Reference implementation of the original scalar scoring."""
+
+    def __init__(self, detector: FakeNewsDetector) -> None:
+        self.fake_indicators = list(detector.fake_indicators)
+        self.credibility_indicators = list(detector.credibility_indicators)
+        self.emotional_words = list(detector.emotional_words)
+        self.urgency_words = list(detector.urgency_words)
+        self.exaggeration_words = list(detector.exaggeration_words)
+
+    def extract_features(self, text: str) -> Dict[str, float]:
+        words = text.split()
+        sentences = re.split(r"[.!?]+", text)
+        features = {}
+        features["word_count"] = len(words)
+        features["sentence_count"] = len([s for s in sentences if s.strip()])
+        features["avg_sentence_length"] = features["word_count"] / max(features["sentence_count"], 1)
+        features["all_caps_ratio"] = sum(1 for word in words if word.isupper() and len(word) > 1) / max(len(words), 1)
+        features["title_case_ratio"] = sum(1 for word in words if word.istitle()) / max(len(words), 1)
+        features["exclamation_ratio"] = text.count("!") / max(len(words), 1)
+        features["question_ratio"] = text.count("?") / max(len(words), 1)
+        features["quotes_ratio"] = text.count('"') / max(len(words), 1)
+        features["fake_indicator_ratio"] = sum(1 for word in words if word.upper() in self.fake_indicators) / max(len(words), 1)
+        features["credibility_indicator_ratio"] = sum(1 for word in words if word.lower() in self.credibility_indicators) / max(len(words), 1)
+        features["emotional_word_ratio"] = sum(1 for word in words if word.lower() in self.emotional_words) / max(len(words), 1)
+        features["urgency_word_ratio"] = sum(1 for word in words if word.lower() in self.urgency_words) / max(len(words), 1)
+        features["exaggeration_word_ratio"] = sum(1 for word in words if word.lower() in self.exaggeration_words) / max(len(words), 1)
+        features["unique_word_ratio"] = len(set(words)) / max(len(words), 1)
+        features["long_word_ratio"] = sum(1 for word in words if len(word) > 6) / max(len(words), 1)
+        return features
+
+    def score(self, features: Dict[str, float]) -> float:
+        weights = {
+            "fake_indicator_ratio": 0.25,
+            "credibility_indicator_ratio": -0.20,
+            "emotional_word_ratio": 0.15,
+            "urgency_word_ratio": 0.10,
+            "exaggeration_word_ratio": 0.15,
+            "all_caps_ratio": 0.10,
+            "exclamation_ratio": 0.05
+        }
+        score = 0.0
+        for feature, weight in weights.items():
+            if feature in features:
+                score += features[feature] * weight
+        return max(0.0, min(1.0, score))
+
+    def explain(self, features: Dict[str, float], score: float) -> str:
+        explanations = []
+        if features.get("fake_indicator_ratio", 0) > 0.05:
+            explanations.append("Contains suspicious buzzwords commonly used in fake news")
+        if features.get("emotional_word_ratio", 0) > 0.1:
+            explanations.append("Uses excessive emotional language")
+        if features.get("urgency_word_ratio", 0) > 0.05:
+            explanations.append("Creates artificial urgency")
+        if features.get("exaggeration_word_ratio", 0) > 0.1:
+            explanations.append("Uses absolute/exaggerated language")
+        if features.get("all_caps_ratio", 0) > 0.1:
+            explanations.append("Excessive use of capital letters")
+        if features.get("credibility_indicator_ratio", 0) > 0.05:
+            explanations.append("Contains credible source indicators")
+        if not explanations:
+            if score > 0.7:
+                explanations.append("Overall writing style suggests fake news")
+            elif score < 0.3:
+                explanations.append("Writing style appears credible")
+            else:
+                explanations.append("Mixed indicators - exercise caution")
+        return "; ".join(explanations)
+
+    def detect(self, text: str, title: str = ""):
+        full_text = f"{title} {text}".strip()
+        features = self.extract_features(full_text)
+        score = self.score(features)
+        return features, score > 0.6, score, self.explain(features, score)
+
+
+EDGE_CASES = [
+    "",
+    "   \n\t ",
+    "no punctuation at all just a run of plain lowercase words",
+    "BREAKING SHOCKING SECRET COVER-UP EXPOSED BY INSIDER TODAY",
+    "BREAKING!!! Shocking SECRET now?! \"quote\" just in",
+    "Ünïcödé ſecret Ǆ ǅ ΣΑ Ω — «cités» 東京 ニュース ÉVIDENCE étude",
+    "evidence. study, STUDY Study... research?",
+]
+
+
+def _corpus() -> List[str]:
+    """Edge cases, seeded lexicon soup and seeded generated articles."""
+    rng = random.Random(1)
+    generator = FakeNewsGenerator(rng=random.Random(2))
+    reference = BaselineDetector(FakeNewsDetector())
+    vocab = (reference.fake_indicators + reference.credibility_indicators + reference.emotional_words
+             + reference.urgency_words + ["x", "Hello", "WORLD", "mind-blowing!", "?", "...", "Ω", "ΣΑ"])
+    texts = list(EDGE_CASES)
+    texts += [" ".join(rng.choice(vocab) for _ in range(rng.randint(0, 200))) for _ in range(200)]
+    for _ in range(200):
+        article = generator.generate_fake_news()
+        texts.append(f"{article.title} {article.content}")
+    return texts
+
+
+@pytest.fixture(scope="module")
+def detector() -> FakeNewsDetector:
+    return FakeNewsDetector()
+
+
+@pytest.fixture(scope="module")
+def reference(detector: FakeNewsDetector) -> BaselineDetector:
+    return BaselineDetector(detector)
+
+
+@pytest.fixture(scope="module")
+def corpus() -> List[str]:
+    return _corpus()
+
+
+def _assert_matches(expected, result) -> None:
+    features, is_fake, score, explanation = expected
+    assert result.is_fake == is_fake
+    assert result.explanation == explanation
+    assert result.confidence_score == pytest.approx(score, abs=TOLERANCE)
+    for name, value in features.items():
+        assert result.features[name] == pytest.approx(value, abs=TOLERANCE), name
+
+
+def test_features_match_baseline(detector: FakeNewsDetector, reference: BaselineDetector, corpus: List[str]) -> None:
+    for text in corpus:
+        expected = reference.extract_features(text)
+        actual = detector._extract_text_features(text)
+        assert list(actual) == list(expected)
+        for name, value in expected.items():
+            assert actual[name] == pytest.approx(value, abs=TOLERANCE), (text, name)
+
+
+def test_detect_fake_news_matches_baseline(detector: FakeNewsDetector, reference: BaselineDetector,
+                                           corpus: List[str]) -> None:
+    for text in corpus:
+        _assert_matches(reference.detect(text, "Title"), detector.detect_fake_news(text, "Title"))
+
+
+def test_detect_batch_matches_baseline(detector: FakeNewsDetector, reference: BaselineDetector,
+                                       corpus: List[str]) -> None:
+    items = [{"title": "Title", "content": text} for text in corpus]
+    for text, result in zip(corpus, detector.detect_batch(items, use_cache=False)):
+        _assert_matches(reference.detect(text, "Title"), result)
+
+
+def test_vectorized_batch_matches_baseline(detector: FakeNewsDetector, reference: BaselineDetector,
+                                           corpus: List[str]) -> None:
+    pytest.importorskip("numpy")
+    items = [{"title": "Title", "content": text} for text in corpus]
+    for text, result in zip(corpus, detector.detect_batch(items, vectorized=True, use_cache=False)):
+        _assert_matches(reference.detect(text, "Title"), result)
@@ -0,0 +1,44 @@
+"""
+Import-time tests for the detector and web app modules.
+Importing app must stay cheap and must not build the engine objects eagerly.
+
+Imports are timed in fresh interpreters, against the budgets of benchmarks/bench_import.py
+(FAKE_NEWS_IMPORT_BUDGET_SCALE scales them on slow machines).
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from bench_import import DEFAULT_BUDGETS, time_import  # noqa: E402
+
+# Fresh interpreters per module; the median is compared with the budget
+REPEAT = 5
+
+# Printed by the child: which lazily built objects of app exist after the import
+_ENGINE_CHECK = """
+import app
+print(app._generator is None, app._detector is None, app._article_pool is None)
+"""
+
+
+def test_app_import_builds_nothing() -> None:
+    output = subprocess.run(
+        [sys.executable, "-c", _ENGINE_CHECK], cwd=ROOT, check=True, capture_output=True, text=True
+    ).stdout.split()
+    assert output == ["True", "True", "True"], "import app built the generator, detector or article pool"
+
+
+@pytest.mark.parametrize("module", sorted(DEFAULT_BUDGETS))
+def test_import_within_budget(module: str) -> None:
+    budget = DEFAULT_BUDGETS[module] * float(os.environ.get("FAKE_NEWS_IMPORT_BUDGET_SCALE", "1"))
+    runs = [time_import(module) for _ in range(REPEAT)]
+    median = statistics.median(seconds for seconds, _ in runs)
+    assert not any(eager for _, eager in runs), f"import {module} built the generator or detector eagerly"
+    assert median <= budget, f"import {module} took {median * 1000:.1f} ms, over its {budget * 1000:.0f} ms budget"
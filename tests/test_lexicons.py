@@ -0,0 +1,95 @@
+"""
+Tests for lexicon packs.
+The memory-mapped index must round-trip every key, follow pack changes and hot-reload.
+"""
+
+import os
+import time
+
+import pytest
+
+from lexicons import (DEFAULT_PACK_DIR, INDEX_FILENAME, LexiconIndex, PackWatcher, load_pack, open_index,
+                      pack_digest, write_pack)
+from main import FakeNewsDetector, build_lexicon_lookup
+
+SURROGATE_TEXT = "hello \ud800 world"
+
+
+@pytest.fixture
+def pack(tmp_path) -> str:
+    """A writable copy of the default pack."""
+    directory = str(tmp_path / "pack")
+    write_pack(directory, load_pack(DEFAULT_PACK_DIR))
+    return directory
+
+
+def _emotional_ratio(detector: FakeNewsDetector, text: str) -> float:
+    return detector.detect_fake_news(text).features["emotional_word_ratio"]
+
+
+def test_index_round_trip(tmp_path) -> None:
+    lookup = {"shocking": 1, "BREAKING": 3, "café": 4, "\ud800": 5, "mind-blowing": 0xFFFF}
+    lookup.update((f"word{index}", index % 7) for index in range(200))
+    path = str(tmp_path / INDEX_FILENAME)
+    LexiconIndex.write(path, lookup, b"d" * 32)
+
+    index = LexiconIndex(path)
+    assert len(index) == len(lookup)
+    assert index.digest == b"d" * 32
+    for key, value in lookup.items():
+        assert index.get(key) == value
+    assert index.get("missing") == 0
+    assert index.get("\udfff", -1) == -1
+
+
+def test_default_pack_index_matches_built_in_lexicons() -> None:
+    built_in = FakeNewsDetector()
+    packed = FakeNewsDetector(lexicon_pack=DEFAULT_PACK_DIR)
+    lookup = build_lexicon_lookup(built_in.lexicons())
+    for key, value in lookup.items():
+        assert packed._tables.lookup.get(key) == value
+    assert packed.fingerprint == built_in.fingerprint
+
+
+def test_pack_detector_scores_lone_surrogates() -> None:
+    detector = FakeNewsDetector(lexicon_pack=DEFAULT_PACK_DIR)
+    assert detector.detect_fake_news(SURROGATE_TEXT).confidence_score == 0.0
+
+
+def test_stale_index_is_rebuilt(pack: str) -> None:
+    lexicons = load_pack(pack)
+    first = open_index(pack, lexicons, build_lexicon_lookup)
+    assert first.get("zorblax") == 0
+
+    lexicons["emotional_words"].append("zorblax")
+    write_pack(pack, lexicons)
+    second = open_index(pack, load_pack(pack), build_lexicon_lookup)
+    assert second.digest == pack_digest(lexicons) != first.digest
+    assert second.get("zorblax") == build_lexicon_lookup(lexicons)["zorblax"]
+    # The index mapped before the rebuild still reads the file it was opened on
+    assert first.get("zorblax") == 0
+
+    with open(os.path.join(pack, INDEX_FILENAME), "r+b") as handle:
+        handle.write(b"JUNK")
+    assert open_index(pack, lexicons, build_lexicon_lookup).get("zorblax") == second.get("zorblax")
+
+
+def test_watcher_hot_reloads_pack(pack: str) -> None:
+    detector = FakeNewsDetector(lexicon_pack=pack)
+    fingerprint = detector.fingerprint
+    assert _emotional_ratio(detector, "zorblax news") == 0.0
+
+    watcher = PackWatcher(pack, detector.load_lexicons, interval=0.02)
+    watcher.start()
+    try:
+        with open(os.path.join(pack, "emotional_words.txt"), "a", encoding="utf-8") as handle:
+            handle.write("zorblax\n")
+        deadline = time.monotonic() + 5.0
+        while detector.fingerprint == fingerprint and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        watcher.stop()
+        watcher.join()
+
+    assert "zorblax" in detector.emotional_words
+    assert _emotional_ratio(detector, "zorblax news") == 0.5
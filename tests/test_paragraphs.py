@@ -0,0 +1,74 @@
+"""
+Tests for paragraph-wise detection.
+detect_paragraphs must agree with detect_fake_news, including the hashed n-gram channel.
+"""
+
+import random
+import threading
+
+import pytest
+
+from main import FakeNewsDetector, FakeNewsGenerator
+
+np = pytest.importorskip("numpy")
+ngrams = pytest.importorskip("ngrams")
+
+
+def _documents():
+    """Seeded multi-paragraph articles, with and without titles."""
+    generator = FakeNewsGenerator(rng=random.Random(7))
+    documents = []
+    for index in range(100):
+        articles = [generator.generate_fake_news() for _ in range(1 + index % 4)]
+        title = articles[0].title if index % 3 else ""
+        documents.append((title, "\n\n".join(article.content for article in articles)))
+    documents.append(("Single", "one paragraph only"))
+    documents.append(("", "first\n\n\n\nsecond after blank lines\n\n   \n\nthird"))
+    return documents
+
+
+@pytest.fixture(scope="module")
+def detector() -> FakeNewsDetector:
+    detector = FakeNewsDetector()
+    weights = np.random.default_rng(3).normal(0.0, 1.0, 1 << 12).astype(np.float32)
+    detector.ngram_channel = ngrams.NgramChannel(weights)
+    detector._update_fingerprint()
+    return detector
+
+
+def test_ngram_channel_matches_detect_fake_news(detector: FakeNewsDetector) -> None:
+    for title, text in _documents():
+        expected = detector.detect_fake_news(text, title)
+        actual = detector.detect_paragraphs(text, title)
+        assert actual.confidence_score == pytest.approx(expected.confidence_score, abs=1e-6)
+        assert actual.is_fake == expected.is_fake
+        assert actual.explanation == expected.explanation
+
+
+def test_cached_paragraphs_still_match(detector: FakeNewsDetector) -> None:
+    title, text = _documents()[5]
+    first = detector.detect_paragraphs(text, title)
+    second = detector.detect_paragraphs(text, title)
+    assert second.confidence_score == first.confidence_score
+
+
+def test_ngram_hashes_while_the_power_table_grows() -> None:
+    # Every thread grows the shared power table with longer words; none may see a partial one
+    words = [["w" * length for length in range(1, size)] for size in (64, 256, 1024, 4096)]
+    expected = [ngrams.ngram_hashes(batch) for batch in words]
+    ngrams._POWERS = np.ones(1, dtype=np.uint64)
+
+    errors = []
+
+    def run(index: int) -> None:
+        pairs = list(zip(words, expected))
+        for batch, hashes in (reversed(pairs) if index % 2 else pairs):
+            if not np.array_equal(ngrams.ngram_hashes(batch), hashes):
+                errors.append(len(batch))
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
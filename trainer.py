@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+Weight trainer for the fake news detector.
+Fits a logistic model over the detector's features by streaming labelled articles through mini-batch SGD.
+
+Usage:
+    python trainer.py labelled.jsonl -o model.json
+    python trainer.py real.jsonl --generate-ratio 1 -o model.json --workers 8
+    python main.py / app.py with FAKE_NEWS_MODEL=model.json
+
+Input records are JSONL objects with "content", an optional "title" and a label in
+"is_fake" (or "label": 1 for fake, 0 for real). With --generate-ratio R, R synthetic
+articles from FakeNewsGenerator are mixed in as fake examples per input record, so a
+file of real articles alone is enough to train on.
+
+Features are extracted in worker processes a chunk at a time and the model is updated
+one mini-batch at a time, so memory stays bounded whatever the input size. Features are
+standardized with statistics taken from the first rows; the written weights have the
+standardization folded in and apply to raw features directly.
+
+With --ngram-bits B the model also learns weights over 2**B hashed word unigrams and
+bigrams (see ngrams.py), saved as <output>.ngrams.npy next to the weight file.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Deque, Dict, Iterator, List, Optional, TextIO, Tuple
+
+import numpy as np
+
+from corpus import CORPUS_REFERENCE_DATE, iter_line_chunks, shard_rng
+from main import FEATURE_NAMES, MODEL_FORMAT, FakeNewsDetector, FakeNewsGenerator
+from ngrams import SparseBatch, hash_documents
+
+# Input lines handed to a worker at a time; also the mini-batch granularity
+DEFAULT_CHUNK_SIZE = 1024
+
+# Rows per SGD update
+DEFAULT_BATCH_SIZE = 256
+
+# Rows used to estimate the feature standardization
+DEFAULT_SCALER_ROWS = 20000
+
+# Chunks allowed in flight per worker; bounds memory independently of input size
+IN_FLIGHT_PER_WORKER = 2
+
+# Shard index stride between epochs, keeping generated articles distinct per epoch
+_EPOCH_SHARD_STRIDE = 1 << 32
+
+# Detector and generator owned by each worker process, built once by _init_worker
+_worker_detector: Optional[FakeNewsDetector] = None
+_worker_generator: Optional[FakeNewsGenerator] = None
+
+
+def _init_worker(lexicon_pack: Optional[str], phrase_matching: bool) -> None:
+    """Build the per-process detector and generator used by _featurize_chunk."""
+    global _worker_detector, _worker_generator
+    _worker_detector = FakeNewsDetector(phrase_matching=phrase_matching, lexicon_pack=lexicon_pack)
+    _worker_generator = FakeNewsGenerator()
+
+
+def parse_label(record: Dict) -> float:
+    """Read the fake (1.0) / real (0.0) label of a record."""
+    label = record.get("is_fake", record.get("label"))
+    if isinstance(label, bool) or label in (0, 1):
+        return float(label)
+    raise ValueError("Label is required (is_fake: true/false or label: 1/0)")
+
+
+Chunk = Tuple[np.ndarray, Optional[SparseBatch], np.ndarray, int]
+
+
+def _featurize_chunk(lines: List[str], generate: int, seed: int, shard: int, ngram_bits: int) -> Chunk:
+    """
+    Extract the feature matrix and labels of a chunk inside a worker process.
+
+    Args:
+        lines: Raw JSONL lines of labelled articles
+        generate: Synthetic fake articles to add to the chunk
+        seed: Root seed of the synthetic articles
+        shard: Shard index of the synthetic articles
+        ngram_bits: Hash bits of the n-gram channel (0 disables it)
+
+    Returns:
+        Tuple of (float32 features (N, F), hashed n-grams or None, float32 labels (N,),
+        invalid records)
+    """
+    items = []
+    labels = []
+    errors = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            content = record.get("content")
+            if not content or not isinstance(content, str):
+                raise ValueError("Content is required")
+            labels.append(parse_label(record))
+            items.append({"title": record.get("title") or "", "content": content})
+        except (ValueError, TypeError, AttributeError):
+            errors += 1
+
+    if generate:
+        generator = _worker_generator
+        generator.rng = shard_rng(seed, shard)
+        generator.reference_date = CORPUS_REFERENCE_DATE
+        for _ in range(generate):
+            article = generator.generate_fake_news()
+            items.append({"title": article.title, "content": article.content})
+            labels.append(1.0)
+
+    matrix = _worker_detector.feature_matrix(items)
+    ngrams = None
+    if ngram_bits:
+        ngrams = hash_documents([f"{item['title']} {item['content']}".strip() for item in items], ngram_bits)
+    return matrix, ngrams, np.asarray(labels, dtype=np.float32), errors
+
+
+class SGDLogisticModel:
+    """
+    Logistic regression trained by mini-batch SGD with AdaGrad step sizes.
+
+    Works on standardized features; export() folds the standardization back into
+    weights over raw features. Hashed n-gram weights, when enabled, are updated only
+    where a mini-batch has non-zero values.
+    """
+
+    def __init__(self, num_features: int, learning_rate: float = 0.1, l2: float = 1e-6,
+                 ngram_bits: int = 0) -> None:
+        self.learning_rate = learning_rate
+        self.l2 = l2
+        self.weights = np.zeros(num_features, dtype=np.float64)
+        self.bias = 0.0
+        self.mean = np.zeros(num_features, dtype=np.float64)
+        self.scale = np.ones(num_features, dtype=np.float64)
+        self._weight_grad_squares = np.full(num_features, 1e-8)
+        self._bias_grad_squares = 1e-8
+        self.ngram_weights = np.zeros(1 << ngram_bits, dtype=np.float32) if ngram_bits else None
+        self._ngram_grad_squares = np.full(1 << ngram_bits, 1e-8, dtype=np.float32) if ngram_bits else None
+        self.rows = 0
+        self.loss_sum = 0.0
+        self.correct = 0
+
+    def fit_scaler(self, matrix: np.ndarray) -> None:
+        """Set the standardization from a sample of rows."""
+        sample = matrix.astype(np.float64)
+        self.mean = sample.mean(axis=0)
+        std = sample.std(axis=0)
+        self.scale = np.where(std > 1e-12, std, 1.0)
+
+    def partial_fit(self, matrix: np.ndarray, labels: np.ndarray, ngrams: Optional[SparseBatch] = None) -> None:
+        """
+        Take one SGD step on a mini-batch.
+
+        The batch is scored before the update, so loss and accuracy accumulate as a
+        progressive validation estimate of performance on unseen rows.
+        """
+        features = (matrix.astype(np.float64) - self.mean) / self.scale
+        targets = labels.astype(np.float64)
+        logits = features @ self.weights + self.bias
+        if ngrams is not None:
+            logits += ngrams.dot(self.ngram_weights)
+        probabilities = 1.0 / (1.0 + np.exp(-np.clip(logits, -35.0, 35.0)))
+
+        self.rows += len(targets)
+        self.loss_sum += float(np.sum(np.logaddexp(0.0, logits) - targets * logits))
+        self.correct += int(np.sum((probabilities > 0.5) == (targets > 0.5)))
+
+        error = probabilities - targets
+        weight_grad = features.T @ error / len(targets) + self.l2 * self.weights
+        bias_grad = float(error.mean())
+        self._weight_grad_squares += weight_grad * weight_grad
+        self._bias_grad_squares += bias_grad * bias_grad
+        self.weights -= self.learning_rate * weight_grad / np.sqrt(self._weight_grad_squares)
+        self.bias -= self.learning_rate * bias_grad / math.sqrt(self._bias_grad_squares)
+
+        if ngrams is not None:
+            columns, inverse = np.unique(ngrams.indices, return_inverse=True)
+            contributions = ngrams.data * error[ngrams.row_ids()]
+            ngram_grad = np.bincount(inverse, weights=contributions, minlength=len(columns)) / len(targets)
+            ngram_grad += self.l2 * self.ngram_weights[columns]
+            self._ngram_grad_squares[columns] += ngram_grad * ngram_grad
+            self.ngram_weights[columns] -= self.learning_rate * ngram_grad / np.sqrt(self._ngram_grad_squares[columns])
+
+    @property
+    def log_loss(self) -> float:
+        """Mean progressive log loss."""
+        return self.loss_sum / max(self.rows, 1)
+
+    @property
+    def accuracy(self) -> float:
+        """Progressive accuracy at a 0.5 threshold."""
+        return self.correct / max(self.rows, 1)
+
+    def export(self) -> Tuple[Dict[str, float], float]:
+        """
+        Weights over raw features.
+
+        Returns:
+            Tuple of (feature name -> weight, bias)
+        """
+        weights = self.weights / self.scale
+        bias = self.bias - float(np.sum(weights * self.mean))
+        return dict(zip(FEATURE_NAMES, weights.tolist())), bias
+
+
+def write_model(path: str, model: SGDLogisticModel, threshold: float, meta: Dict) -> None:
+    """
+    Write a weight file loadable by FakeNewsDetector.load_model.
+
+    N-gram weights, if any, are written to <path without extension>.ngrams.npy and
+    referenced from the weight file by name.
+
+    Args:
+        path: Destination path
+        model: Trained model
+        threshold: Probability above which an article is reported as fake
+        meta: Extra fields recorded in the file (training statistics)
+    """
+    weights, bias = model.export()
+    payload = {
+        "format": MODEL_FORMAT,
+        "weights": weights,
+        "bias": bias,
+        "threshold": threshold,
+        **meta
+    }
+    if model.ngram_weights is not None:
+        ngram_path = f"{os.path.splitext(path)[0]}.ngrams.npy"
+        with open(f"{ngram_path}.tmp", "wb") as handle:
+            np.save(handle, model.ngram_weights)
+        os.replace(f"{ngram_path}.tmp", ngram_path)
+        payload["ngram_weights"] = os.path.basename(ngram_path)
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=2)
+        handle.write("\n")
+    os.replace(temp_path, path)
+
+
+def _iter_batches(paths: List[str], epochs: int, chunk_size: int, generate_ratio: float, seed: int,
+                  ngram_bits: int, workers: int, lexicon_pack: Optional[str],
+                  phrase_matching: bool) -> Iterator[Chunk]:
+    """Yield featurized chunks of the training stream, in input order."""
+    def tasks() -> Iterator[Tuple[List[str], int, int, int, int]]:
+        for epoch in range(epochs):
+            shard = 0
+            records = 0
+            for path in paths:
+                handle = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+                try:
+                    for _, lines in iter_line_chunks(handle, chunk_size):
+                        # Spread fractional ratios evenly over the chunks
+                        generate = int((records + len(lines)) * generate_ratio) - int(records * generate_ratio)
+                        records += len(lines)
+                        yield lines, generate, seed, epoch * _EPOCH_SHARD_STRIDE + shard, ngram_bits
+                        shard += 1
+                finally:
+                    if handle is not sys.stdin:
+                        handle.close()
+
+    if workers == 1:
+        _init_worker(lexicon_pack, phrase_matching)
+        for task in tasks():
+            yield _featurize_chunk(*task)
+        return
+
+    max_in_flight = workers * IN_FLIGHT_PER_WORKER
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(lexicon_pack, phrase_matching)) as executor:
+        queue: Deque[Future] = deque()
+        for task in tasks():
+            if len(queue) >= max_in_flight:
+                yield queue.popleft().result()
+            queue.append(executor.submit(_featurize_chunk, *task))
+        while queue:
+            yield queue.popleft().result()
+
+
+def train(paths: List[str], epochs: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE,
+          batch_size: int = DEFAULT_BATCH_SIZE, generate_ratio: float = 0.0, seed: int = 0,
+          ngram_bits: int = 0, workers: int = 1, learning_rate: float = 0.1, l2: float = 1e-6,
+          scaler_rows: int = DEFAULT_SCALER_ROWS, lexicon_pack: Optional[str] = None,
+          phrase_matching: bool = False, progress: Optional[TextIO] = None,
+          progress_interval: float = 5.0) -> Tuple[SGDLogisticModel, Dict]:
+    """
+    Train a logistic model on a stream of labelled articles.
+
+    Args:
+        paths: JSONL inputs (- for stdin), read in order every epoch
+        epochs: Passes over the inputs
+        chunk_size: Input lines featurized per worker task
+        batch_size: Rows per SGD update
+        generate_ratio: Synthetic fake articles mixed in per input record
+        seed: Seed of the synthetic articles and the in-chunk shuffle
+        ngram_bits: Hash bits of the n-gram channel (0 disables it)
+        workers: Feature extraction processes
+        learning_rate: AdaGrad base step size
+        l2: L2 regularization strength
+        scaler_rows: Rows buffered to estimate the feature standardization
+        lexicon_pack: Lexicon pack of the detector the model is trained for
+        phrase_matching: Phrase matching setting of that detector
+        progress: Stream for progress lines (None disables them)
+        progress_interval: Seconds between progress lines
+
+    Returns:
+        Tuple of (trained model, training statistics)
+    """
+    model = SGDLogisticModel(len(FEATURE_NAMES), learning_rate, l2, ngram_bits)
+    shuffle_rng = np.random.default_rng(seed)
+    started = time.monotonic()
+    last_report = started
+    errors = 0
+    positives = 0
+
+    # Chunks buffered until the scaler is fitted, then replayed
+    pending: List[Tuple[np.ndarray, Optional[SparseBatch], np.ndarray]] = []
+    pending_rows = 0
+    scaler_ready = False
+
+    def fit(matrix: np.ndarray, ngrams: Optional[SparseBatch], labels: np.ndarray) -> None:
+        order = shuffle_rng.permutation(len(labels))
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            model.partial_fit(matrix[batch], labels[batch], ngrams.take(batch) if ngrams is not None else None)
+
+    for matrix, ngrams, labels, chunk_errors in _iter_batches(paths, epochs, chunk_size, generate_ratio, seed,
+                                                              ngram_bits, workers, lexicon_pack, phrase_matching):
+        errors += chunk_errors
+        positives += int(labels.sum())
+        if not scaler_ready:
+            pending.append((matrix, ngrams, labels))
+            pending_rows += len(labels)
+            if pending_rows < scaler_rows:
+                continue
+            model.fit_scaler(np.concatenate([chunk for chunk, _, _ in pending]))
+            scaler_ready = True
+            for buffered in pending:
+                fit(*buffered)
+            pending = []
+            continue
+        fit(matrix, ngrams, labels)
+
+        now = time.monotonic()
+        if progress is not None and now - last_report >= progress_interval:
+            last_report = now
+            print(f"rows {model.rows:,}  {model.rows / (now - started):,.0f} rows/s  "
+                  f"log loss {model.log_loss:.4f}  accuracy {model.accuracy:.4f}", file=progress)
+
+    if pending:
+        model.fit_scaler(np.concatenate([chunk for chunk, _, _ in pending]))
+        for buffered in pending:
+            fit(*buffered)
+
+    if not model.rows:
+        raise ValueError("No labelled rows to train on")
+    if positives in (0, model.rows):
+        raise ValueError("Training data must contain both fake and real articles")
+
+    stats = {
+        "rows": model.rows,
+        "positives": positives,
+        "invalid_records": errors,
+        "epochs": epochs,
+        "ngram_bits": ngram_bits,
+        "log_loss": model.log_loss,
+        "accuracy": model.accuracy,
+        "seconds": time.monotonic() - started
+    }
+    return model, stats
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser."""
+    parser = argparse.ArgumentParser(description="Train detector weights from labelled articles")
+    parser.add_argument("inputs", nargs="+", help="Labelled JSONL files, or - for stdin")
+    parser.add_argument("-o", "--output", required=True, help="Weight file to write")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--epochs", type=int, default=1, help="Passes over the inputs")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Lines per worker task")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per SGD update")
+    parser.add_argument("--generate-ratio", type=float, default=0.0,
+                        help="Synthetic fake articles mixed in per input record")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of synthetic articles and shuffling")
+    parser.add_argument("--ngram-bits", type=int, default=0,
+                        help="Also learn hashed unigram/bigram weights over 2**BITS columns (0: off)")
+    parser.add_argument("--learning-rate", type=float, default=0.1, help="AdaGrad base step size")
+    parser.add_argument("--l2", type=float, default=1e-6, help="L2 regularization strength")
+    parser.add_argument("--scaler-rows", type=int, default=DEFAULT_SCALER_ROWS,
+                        help="Rows used to estimate feature standardization")
+    parser.add_argument("--threshold", type=float, default=0.5, help="Decision threshold stored in the model")
+    parser.add_argument("--lexicon-pack", default=None, help="Lexicon pack of the target detector")
+    parser.add_argument("--phrase-matching", action="store_true", help="Train for a phrase-matching detector")
+    parser.add_argument("--progress-interval", type=float, default=5.0, help="Seconds between progress lines")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Disable progress output")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    args = build_parser().parse_args(argv)
+    if args.inputs.count("-") > 1 or ("-" in args.inputs and args.epochs > 1):
+        print("stdin can only be read once", file=sys.stderr)
+        return 2
+
+    try:
+        model, stats = train(
+            args.inputs,
+            epochs=args.epochs,
+            chunk_size=args.chunk_size,
+            batch_size=args.batch_size,
+            generate_ratio=args.generate_ratio,
+            seed=args.seed,
+            ngram_bits=args.ngram_bits,
+            workers=args.workers or os.cpu_count() or 1,
+            learning_rate=args.learning_rate,
+            l2=args.l2,
+            scaler_rows=args.scaler_rows,
+            lexicon_pack=args.lexicon_pack,
+            phrase_matching=args.phrase_matching,
+            progress=None if args.quiet else sys.stderr,
+            progress_interval=args.progress_interval
+        )
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    stats["created"] = datetime.now(timezone.utc).isoformat()
+    write_model(args.output, model, args.threshold, stats)
+    if not args.quiet:
+        print(f"trained on {stats['rows']:,} rows in {stats['seconds']:.1f}s  "
+              f"log loss {stats['log_loss']:.4f}  accuracy {stats['accuracy']:.4f}  -> {args.output}",
+              file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
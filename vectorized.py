@@ -0,0 +1,157 @@
+"""
+Vectorized scoring for the fake news detector.
+Scores batches of articles as an (N x F) float32 feature matrix using NumPy array operations.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from main import EXPLANATION_RULES, FAKE_THRESHOLD, FEATURE_NAMES, FEATURE_WEIGHTS
+
+# Column index of every feature in the matrix
+FEATURE_INDEX = {name: index for index, name in enumerate(FEATURE_NAMES)}
+
+# Explanation rule columns and thresholds, in EXPLANATION_RULES order
+_RULE_COLUMNS = np.array([FEATURE_INDEX[feature] for feature, _, _ in EXPLANATION_RULES], dtype=np.intp)
+_RULE_THRESHOLDS = np.array([threshold for _, threshold, _ in EXPLANATION_RULES], dtype=np.float32)
+_RULE_BITS = 1 << np.arange(len(EXPLANATION_RULES), dtype=np.int64)
+
+
+def features_to_matrix(features_list: Sequence[Dict[str, float]]) -> np.ndarray:
+    """
+    Stack feature dicts into a feature matrix.
+
+    Args:
+        features_list: Feature dicts as returned by FakeNewsDetector._extract_text_features
+
+    Returns:
+        float32 array of shape (N, len(FEATURE_NAMES)) in FEATURE_NAMES column order
+    """
+    rows = [[features.get(name, 0.0) for name in FEATURE_NAMES] for features in features_list]
+    return np.array(rows, dtype=np.float32).reshape(len(rows), len(FEATURE_NAMES))
+
+
+def weight_vector(weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """
+    Build a dense weight vector aligned with the feature matrix columns.
+
+    Args:
+        weights: Feature name -> weight mapping (defaults to FEATURE_WEIGHTS)
+
+    Returns:
+        float32 array of shape (len(FEATURE_NAMES),)
+    """
+    vector = np.zeros(len(FEATURE_NAMES), dtype=np.float32)
+    for name, weight in (FEATURE_WEIGHTS if weights is None else weights).items():
+        vector[FEATURE_INDEX[name]] = weight
+    return vector
+
+
+def score_matrix(matrix: np.ndarray, weights: Optional[np.ndarray] = None,
+                 bias: Optional[float] = None, offsets: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Calculate fake news probability scores for every row of a feature matrix.
+
+    Args:
+        matrix: Feature matrix of shape (N, F)
+        weights: Weight vector of shape (F,) (defaults to weight_vector())
+        bias: Intercept of a learned logistic model; None clips the weighted sum instead
+        offsets: Per-row additions to the weighted sum (e.g. n-gram channel scores)
+
+    Returns:
+        float32 array of shape (N,) in the 0-1 range
+    """
+    if weights is None:
+        weights = weight_vector()
+    scores = matrix @ weights
+    if offsets is not None:
+        scores = scores + offsets
+    if bias is None:
+        return np.clip(scores, 0.0, 1.0)
+    return sigmoid(scores + np.float32(bias))
+
+
+def sigmoid(values: np.ndarray) -> np.ndarray:
+    """Numerically stable logistic function."""
+    odds = np.exp(-np.abs(values))
+    return np.where(values >= 0, 1.0 / (1.0 + odds), odds / (1.0 + odds)).astype(values.dtype, copy=False)
+
+
+def classify_scores(scores: np.ndarray, threshold: float = FAKE_THRESHOLD) -> np.ndarray:
+    """
+    Threshold scores into fake/credible verdicts.
+
+    Args:
+        scores: Scores of shape (N,)
+        threshold: Scores above this value are fake
+
+    Returns:
+        bool array of shape (N,)
+    """
+    return scores > threshold
+
+
+def explanation_flags(matrix: np.ndarray) -> np.ndarray:
+    """
+    Evaluate every explanation rule against every row of a feature matrix.
+
+    Args:
+        matrix: Feature matrix of shape (N, F)
+
+    Returns:
+        bool array of shape (N, len(EXPLANATION_RULES))
+    """
+    return matrix[:, _RULE_COLUMNS] > _RULE_THRESHOLDS
+
+
+def explain(flags: np.ndarray, scores: np.ndarray) -> List[str]:
+    """
+    Generate human-readable explanations from explanation flags.
+
+    Args:
+        flags: Output of explanation_flags, shape (N, R)
+        scores: Scores of shape (N,)
+
+    Returns:
+        List of explanation strings, one per row
+    """
+    rendered, codes = explain_codes(flags, scores)
+    return [rendered[code] for code in codes.tolist()]
+
+
+def explain_codes(flags: np.ndarray, scores: np.ndarray) -> Tuple[Tuple[str, ...], np.ndarray]:
+    """
+    Generate dictionary-encoded explanations from explanation flags.
+
+    Rows are reduced to a rule bitmask so each distinct combination of flags and
+    score band is rendered once, however many rows share it.
+
+    Args:
+        flags: Output of explanation_flags, shape (N, R)
+        scores: Scores of shape (N,)
+
+    Returns:
+        Tuple of (distinct explanations, int32 array of shape (N,) indexing into them)
+    """
+    codes = flags.astype(np.int64) @ _RULE_BITS
+    # Rows without any flag fall back to a message chosen by score band
+    bands = np.where(scores > 0.7, 0, np.where(scores < 0.3, 1, 2))
+    keys = np.where(codes > 0, codes, -1 - bands)
+
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    fallbacks = (
+        "Overall writing style suggests fake news",
+        "Writing style appears credible",
+        "Mixed indicators - exercise caution"
+    )
+
+    rendered = []
+    for key in unique_keys.tolist():
+        if key < 0:
+            rendered.append(fallbacks[-1 - key])
+        else:
+            rendered.append("; ".join(
+                message for bit, (_, _, message) in enumerate(EXPLANATION_RULES) if key >> bit & 1
+            ))
+    return tuple(rendered), inverse.reshape(-1).astype(np.int32)